@@ -1,5 +1,7 @@
+import asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import text
 from .config import settings
 
 # Create async engine
@@ -13,9 +15,124 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# Read-only endpoints use this engine. Its transactions are started READ ONLY,
+# so a stray write fails loudly instead of landing on (or waiting for) a replica.
+read_engine = (
+    create_async_engine(settings.DATABASE_READ_URL, echo=False)
+    if settings.DATABASE_READ_URL
+    else engine
+).execution_options(postgresql_readonly=True)
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 class Base(DeclarativeBase):
     pass
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db():
+    """Session for endpoints that never write (dashboard polling)."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+async def warm_db_pool():
+    """Open the pool's connections up front so early requests don't pay connect latency."""
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(engine.pool.size())))
+
+# Expression indexes for the compact search strategies (services/vector_search.py).
+# Only the configured strategy's index is built; idx_embedding_hnsw can then be
+# dropped by hand to reclaim its space. Needs pgvector >= 0.7.
+VECTOR_INDEX_UPGRADES = {
+    "halfvec": [
+        "CREATE INDEX IF NOT EXISTS idx_embedding_halfvec_hnsw ON entries "
+        "USING hnsw ((embedding::halfvec(384)) halfvec_cosine_ops)",
+    ],
+    "binary": [
+        "CREATE INDEX IF NOT EXISTS idx_embedding_binary_hnsw ON entries "
+        "USING hnsw ((binary_quantize(embedding)::bit(384)) bit_hamming_ops)",
+    ],
+}
+
+# create_all only creates missing tables, so columns and indexes added to
+# existing tables are applied here. Every statement must be idempotent.
+SCHEMA_UPGRADES = [
+    # A newer pgvector image doesn't upgrade the extension in existing
+    # databases; without this the HNSW/halfvec/binary_quantize statements
+    # below fail against the old extension version.
+    "ALTER EXTENSION vector UPDATE",
+    # The old IVFFlat index used the default L2 opclass, so cosine (<=>)
+    # queries never used it. HNSW with cosine ops replaces it (pgvector >= 0.5).
+    "DROP INDEX IF EXISTS idx_embedding_ivfflat",
+    "CREATE INDEX IF NOT EXISTS idx_embedding_hnsw ON entries USING hnsw (embedding vector_cosine_ops)",
+    "ALTER TABLE entries ADD COLUMN IF NOT EXISTS content_fingerprint VARCHAR(64)",
+    "ALTER TABLE entries ADD COLUMN IF NOT EXISTS simhash BIGINT",
+    "ALTER TABLE entries ADD COLUMN IF NOT EXISTS simhash_bands INTEGER[]",
+    "CREATE INDEX IF NOT EXISTS idx_user_fingerprint ON entries (user_id, content_fingerprint)",
+    "CREATE INDEX IF NOT EXISTS idx_simhash_bands ON entries USING gin (simhash_bands)",
+    "ALTER TABLE streak_data ADD COLUMN IF NOT EXISTS current_run_start DATE",
+    # Rows from before incremental tracking: start of the run of consecutive
+    # entry days ending at the latest one (gaps and islands), so reads don't
+    # show a 0 streak until the user posts again. Only touches NULL rows.
+    """WITH days AS (
+           SELECT DISTINCT e.user_id, e.date
+           FROM entries e JOIN streak_data s ON s.user_id = e.user_id
+           WHERE s.current_run_start IS NULL
+       ), runs AS (
+           SELECT user_id, min(date) AS run_start, max(date) AS run_end
+           FROM (SELECT user_id, date, date - CAST(row_number() OVER (PARTITION BY user_id ORDER BY date) AS integer) AS island
+                 FROM days) islands
+           GROUP BY user_id, island
+       ), latest AS (
+           SELECT DISTINCT ON (user_id) user_id, run_start, run_end
+           FROM runs
+           ORDER BY user_id, run_end DESC
+       )
+       UPDATE streak_data s
+       SET current_run_start = latest.run_start, last_entry_date = latest.run_end
+       FROM latest
+       WHERE s.user_id = latest.user_id AND s.current_run_start IS NULL""",
+    # Drop duplicate unlocks left by the old check-then-insert path (keeping
+    # the first row) so the unique index can be built.
+    """DELETE FROM user_achievements a
+       USING user_achievements b
+       WHERE a.user_id = b.user_id AND a.achievement_id = b.achievement_id AND a.ctid > b.ctid""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_achievement ON user_achievements (user_id, achievement_id)",
+    # Rewrites the table once on large databases, so expect a slow first start
+    "ALTER TABLE entries ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', content)) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_entries_search ON entries USING gin (search_vector)",
+    # Every embedding stored before versioning came from the original model.
+    # The default fills existing rows without a rewrite, then is dropped so
+    # new rows always get the version from the app.
+    "ALTER TABLE entries ADD COLUMN IF NOT EXISTS embedding_model_version varchar(100) DEFAULT 'all-MiniLM-L6-v2'",
+    "ALTER TABLE entries ALTER COLUMN embedding_model_version DROP DEFAULT",
+    "CREATE INDEX IF NOT EXISTS idx_outbox_processed ON task_outbox (processed_at) WHERE processed_at IS NOT NULL",
+    *VECTOR_INDEX_UPGRADES.get(settings.VECTOR_SEARCH_STRATEGY, []),
+]
+
+async def apply_schema_upgrades(conn) -> list[tuple[str, Exception]]:
+    """
+    Apply SCHEMA_UPGRADES, each in its own savepoint.
+
+    A statement the server can't run (e.g. an index type from a newer pgvector)
+    is skipped rather than blocking startup. Returns the failures for logging.
+    """
+    failures = []
+    for statement in SCHEMA_UPGRADES:
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(statement))
+        except Exception as e:
+            failures.append((statement, e))
+    return failures
@@ -1,21 +1,61 @@
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import structlog
 import asyncio
 import sys
 from contextlib import asynccontextmanager
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from .models.achievement import Achievement
 from .models.user import User
 from .models.entry import Entry
 from .models.streak import StreakData
-from .database import engine, Base, AsyncSessionLocal
+from .models.outbox import OutboxTask
+from .models.stats import UserDailyStats, UserStatsTotals
+from .database import engine, Base, AsyncSessionLocal, apply_schema_upgrades, warm_db_pool
 from .config import settings
+from .services.embedding_executor import embedding_executor, EmbeddingPoolSaturated
+from .services.embedding_cache import embedding_cache, query_embedding_cache
+from .services.user_embedding_cache import user_embedding_cache
+from .services.ai_validator import ai_validator
+from .services.achievement_catalog import achievement_catalog
+from .services.task_queue import task_queue
+from .services.topic_engine import topic_engine
+from .services.vector_search import check_pgvector
 
 logger = structlog.get_logger()
 
+# Cap on the delay between warm-up attempts
+WARMUP_MAX_BACKOFF_SECONDS = 30
+
+async def warm_up(app: FastAPI):
+    """
+    Warm the DB pool and (opt-in) the embedding model before reporting ready.
+
+    Retries with exponential backoff until both succeed (e.g. the DB isn't
+    accepting connections yet at boot), so /health/ready recovers on its own.
+    Steps that already succeeded aren't repeated.
+    """
+    attempt = 0
+    while True:
+        try:
+            if not app.state.db_pool_warm:
+                await warm_db_pool()
+                app.state.db_pool_warm = True
+
+            if settings.PRELOAD_EMBEDDING_MODEL and not ai_validator.warmed_up:
+                logger.info("Preloading embedding model...")
+                await ai_validator.warm_up()
+            logger.info("Warm-up complete.")
+            return
+        except Exception as e:
+            attempt += 1
+            delay = min(2 ** attempt, WARMUP_MAX_BACKOFF_SECONDS)
+            logger.error(f"Warm-up failed (attempt {attempt}), retrying in {delay}s: {str(e)}")
+            await asyncio.sleep(delay)
+
 # Create tables and seed achievements on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -51,6 +91,11 @@ async def lifespan(app: FastAPI):
             logger.info(f"Connecting to database (Attempt {attempt + 1}/{max_retries})...")
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                for statement, error in await apply_schema_upgrades(conn):
+                    logger.error(f"Schema upgrade failed: {statement}", error=str(error))
+                fallback = await check_pgvector(conn)
+                if fallback:
+                    logger.warning(fallback)
             logger.info("Database connection established and tables verified.")
             break
         except Exception as e:
@@ -81,13 +126,26 @@ async def lifespan(app: FastAPI):
                     print(f"Seeding achievement: {seed.name}")
 
             await db.commit()
+
+            # Seeds may have changed the catalog, so reload the process-wide copy
+            achievement_catalog.invalidate()
+            await achievement_catalog.all(db)
     except Exception as e:
         logger.error(f"Error during seeding: {str(e)}")
         # Don't crash if seeding fails, just log it.
         pass
 
+    # Warm up in the background so liveness probes are answered meanwhile
+    app.state.db_pool_warm = False
+    warmup_task = asyncio.create_task(warm_up(app))
+    task_queue.start()
+
     yield
 
+    warmup_task.cancel()
+    await task_queue.stop()
+    embedding_executor.shutdown()
+
 app = FastAPI(
     title="LearnLog AI API",
     description="Backend API for LearnLog AI",
@@ -110,16 +168,62 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"], # GET /entries pagination
 )
 
+@app.exception_handler(EmbeddingPoolSaturated)
+async def embedding_pool_saturated_handler(request: Request, exc: EmbeddingPoolSaturated):
+    # Shed load instead of queueing more work behind the model
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The AI validator is busy. Please try again in a moment."},
+        headers={"Retry-After": "1"},
+    )
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to LearnLog AI API"}
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
+    """Liveness: the process is up and serving requests."""
     return {"status": "healthy"}
 
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    """Readiness: route traffic here only once the DB pool and model are warm."""
+    checks = {
+        "database": getattr(app.state, "db_pool_warm", False),
+        "model": ai_validator.warmed_up or not settings.PRELOAD_EMBEDDING_MODEL,
+    }
+    if checks["database"]:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception:
+            checks["database"] = False
+
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "not_ready", "checks": checks}
+
+@app.get("/metrics")
+async def metrics():
+    """In-process counters for the embedding pipeline and task queue."""
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "user_embedding_cache": user_embedding_cache.stats(),
+        "embedding_pool": {
+            "pending": embedding_executor.pending,
+            "max_pending": embedding_executor.max_pending,
+        },
+        "task_queue": task_queue.stats(),
+        "topic_engine": topic_engine.stats(),
+    }
+
 from .routers import entries, streaks, analytics, users, achievements
 
 app.include_router(entries.router, prefix="/api/v1")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, text
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -28,3 +28,8 @@ class UserAchievement(Base):
     # Relationships
     user = relationship("User", back_populates="achievements")
     achievement = relationship("Achievement", back_populates="user_achievements")
+
+    __table_args__ = (
+        # Each achievement unlocks once per user; inserts use ON CONFLICT DO NOTHING
+        Index('uq_user_achievement', 'user_id', 'achievement_id', unique=True),
+    )
@@ -1,8 +1,9 @@
 import uuid
-from sqlalchemy import Column, Text, Date, DateTime, Integer, Float, ForeignKey, Index, func, String
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Text, Date, DateTime, Integer, BigInteger, Float, ForeignKey, Index, func, String
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from pgvector.sqlalchemy import Vector
+from ..config import settings
 from ..database import Base
 
 class Entry(Base):
@@ -12,6 +13,11 @@ class Entry(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
     embedding = Column(Vector(384), nullable=False)
+    # settings.EMBEDDING_MODEL_VERSION at encode time. Novelty checks only compare
+    # rows at the current version, so direct inserts (scripts, seeds) default to it.
+    embedding_model_version = Column(
+        String(100), nullable=True, default=lambda: settings.EMBEDDING_MODEL_VERSION
+    )
     date = Column(Date, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -20,12 +26,23 @@ class Entry(Base):
     ai_score = Column(Float, nullable=True)
     tags = Column(JSONB, nullable=True)
     
+    # Duplicate detection (see services/fingerprint.py)
+    content_fingerprint = Column(String(64), nullable=True) # SHA-256 of normalized content
+    simhash = Column(BigInteger, nullable=True)
+    simhash_bands = Column(ARRAY(Integer), nullable=True)
+    
+    # Full-text search (see services/text_search.py); deferred so listings don't load it
+    search_vector = deferred(Column(TSVECTOR, Computed("to_tsvector('english', content)", persisted=True)))
+    
     # Relationships
     user = relationship("User", back_populates="entries")
     
     __table_args__ = (
         Index('idx_user_date', 'user_id', 'date'),
-        Index('idx_embedding_ivfflat', 'embedding', postgresql_using='ivfflat', postgresql_with={'lists': 100}),
+        Index('idx_embedding_hnsw', 'embedding', postgresql_using='hnsw', postgresql_ops={'embedding': 'vector_cosine_ops'}),
+        Index('idx_user_fingerprint', 'user_id', 'content_fingerprint'),
+        Index('idx_simhash_bands', 'simhash_bands', postgresql_using='gin'),
+        Index('idx_entries_search', 'search_vector', postgresql_using='gin'),
     )
 
 class RejectionLog(Base):
@@ -0,0 +1,23 @@
+import uuid
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from ..database import Base
+
+class OutboxTask(Base):
+    """Deferred work written in the same transaction as the change that caused it."""
+    __tablename__ = "task_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False) # Handler name, e.g. "entry_created"
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    available_at = Column(DateTime(timezone=True), server_default=func.now()) # Pushed back on retry
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True) # Also set once attempts run out
+
+    __table_args__ = (
+        Index('idx_outbox_pending', 'available_at', postgresql_where=text('processed_at IS NULL')),
+        # Finds rows past retention for pruning without touching pending ones
+        Index('idx_outbox_processed', 'processed_at', postgresql_where=text('processed_at IS NOT NULL')),
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, Integer, BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from ..database import Base
+
+class UserDailyStats(Base):
+    """Entries and words per user per day, maintained on insert (services/daily_stats.py)."""
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    entry_count = Column(Integer, nullable=False, default=0)
+    word_count = Column(Integer, nullable=False, default=0)
+
+class UserStatsTotals(Base):
+    """Lifetime totals per user, so totals don't need to sum every day."""
+    __tablename__ = "user_stats_totals"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entry_count = Column(Integer, nullable=False, default=0)
+    word_count = Column(BigInteger, nullable=False, default=0)
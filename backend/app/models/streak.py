@@ -13,5 +13,7 @@ class StreakData(Base):
     longest_streak = Column(Integer, default=0)
     total_entries = Column(Integer, default=0)
     last_entry_date = Column(Date, nullable=True)
+    # First day of the consecutive run that ends at last_entry_date
+    current_run_start = Column(Date, nullable=True)
     
     user = relationship("User", back_populates="streak_data")
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from ..database import get_db
-from ..models.achievement import Achievement, UserAchievement
+from ..models.achievement import UserAchievement
+from ..services.achievement_catalog import achievement_catalog
 from uuid import UUID
 from typing import List
 from pydantic import BaseModel
@@ -29,14 +30,14 @@ async def get_user_achievements(
 ):
     """Get all achievements with unlock status for a user"""
     # Get all achievements
-    achievements_result = await db.execute(select(Achievement))
-    all_achievements = achievements_result.scalars().all()
+    all_achievements = await achievement_catalog.all(db)
     
     # Get user's unlocked achievements
     user_achievements_result = await db.execute(
-        select(UserAchievement).where(UserAchievement.user_id == user_id)
+        select(UserAchievement.achievement_id, UserAchievement.unlocked_at)
+        .where(UserAchievement.user_id == user_id)
     )
-    user_achievements = {ua.achievement_id: ua.unlocked_at for ua in user_achievements_result.scalars().all()}
+    user_achievements = dict(user_achievements_result.fetchall())
     
     # Build response
     response = []
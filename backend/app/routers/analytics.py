@@ -3,95 +3,133 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from datetime import date, timedelta
 from uuid import UUID
-from ..database import get_db
-from ..models.entry import Entry
+from ..database import get_read_db
+from ..models.stats import UserDailyStats, UserStatsTotals
+from ..models.streak import StreakData
+from ..services.streak_calculator import effective_current_streak
+from ..services.topic_engine import topic_engine
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
-@router.get("/summary")
-async def get_analytics_summary(
-    user_id: UUID, 
-    db: AsyncSession = Depends(get_db)
-):
-    today = date.today()
+async def _load_dashboard_row(user_id: UUID, db: AsyncSession, today: date):
+    """
+    Everything the dashboard shows, in one query.
+
+    The last 30 days of rollups are aggregated with FILTER clauses (week and
+    month counts, plus the 7-day activity arrays) and joined with the user's
+    lifetime totals and streak row. Every analytics endpoint reads from this.
+    """
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
-    
-    # Entries this week
-    week_entries = await db.scalar(
-        select(func.count(Entry.id))
-        .where(Entry.user_id == user_id, Entry.date >= week_ago)
-    )
-    
-    # Entries this month
-    month_entries = await db.scalar(
-        select(func.count(Entry.id))
-        .where(Entry.user_id == user_id, Entry.date >= month_ago)
+    activity_start = today - timedelta(days=6) # Include today
+    in_activity = UserDailyStats.date >= activity_start
+
+    daily = (
+        select(
+            func.sum(UserDailyStats.entry_count).filter(UserDailyStats.date >= week_ago).label("week_entries"),
+            func.sum(UserDailyStats.entry_count).label("month_entries"),
+            func.array_agg(UserDailyStats.date).filter(in_activity).label("activity_dates"),
+            func.array_agg(UserDailyStats.word_count).filter(in_activity).label("activity_words"),
+            func.array_agg(UserDailyStats.entry_count).filter(in_activity).label("activity_entries"),
+        )
+        .where(UserDailyStats.user_id == user_id, UserDailyStats.date >= month_ago)
+        .subquery()
     )
-    
-    # Average word count
-    avg_words = await db.scalar(
-        select(func.avg(Entry.word_count))
-        .where(Entry.user_id == user_id)
+    result = await db.execute(
+        select(
+            daily,
+            UserStatsTotals.entry_count.label("total_entries"),
+            UserStatsTotals.word_count.label("total_words"),
+            StreakData.last_entry_date,
+            StreakData.current_run_start,
+            StreakData.longest_streak,
+        )
+        .select_from(daily)
+        .outerjoin(UserStatsTotals, UserStatsTotals.user_id == user_id)
+        .outerjoin(StreakData, StreakData.user_id == user_id)
     )
-    
+    return result.fetchone()
+
+def _summary(row, top_topics):
+    total_entries = row.total_entries or 0
+    avg_words = (row.total_words or 0) / total_entries if total_entries else 0
+    return {
+        "entries_this_week": row.week_entries or 0,
+        "entries_this_month": row.month_entries or 0,
+        "avg_word_count": round(avg_words, 1),
+        "top_topics": top_topics
+    }
+
+def _stats(row):
+    total_entries = row.total_entries or 0
+    # Calculate level (1 level per 10 entries, starting at level 1)
+    level = max(1, total_entries // 10 + 1)
+    return {
+        "total_entries": total_entries,
+        "total_words": row.total_words or 0,
+        "level": level,
+    }
+
+def _activity(row, today: date):
+    start = today - timedelta(days=6)
+    # Process into daily map
+    data_map = { (start + timedelta(days=i)): {"date": (start + timedelta(days=i)).strftime("%a"), "words": 0, "entries": 0} for i in range(7) }
+
+    for day, words, entries in zip(row.activity_dates or [], row.activity_words or [], row.activity_entries or []):
+        if day in data_map:
+            data_map[day]["words"] = words
+            data_map[day]["entries"] = entries
+
+    return list(data_map.values())
+
+def _streak(row, today: date):
+    current = effective_current_streak(row.last_entry_date, row.current_run_start, today)
     return {
-        "entries_this_week": week_entries or 0,
-        "entries_this_month": month_entries or 0,
-        "avg_word_count": round(avg_words or 0, 1),
-        "top_topics": ["Learning", "Coding", "Growth"] 
+        "current_streak": current,
+        "longest_streak": max(row.longest_streak or 0, current),
     }
 
+@router.get("/summary")
+async def get_analytics_summary(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_read_db)
+):
+    row = await _load_dashboard_row(user_id, db, date.today())
+    return _summary(row, await topic_engine.top_topics(db, user_id))
+
 @router.get("/stats")
 async def get_user_stats(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get overall user statistics for dashboard"""
-    # Total entries
-    total_entries = await db.scalar(
-        select(func.count(Entry.id)).where(Entry.user_id == user_id)
-    )
-    
-    # Total words
-    total_words = await db.scalar(
-        select(func.sum(Entry.word_count)).where(Entry.user_id == user_id)
-    )
-    
-    # Calculate level (1 level per 10 entries, starting at level 1)
-    level = max(1, (total_entries or 0) // 10 + 1)
-    
-    return {
-        "total_entries": total_entries or 0,
-        "total_words": total_words or 0,
-        "level": level,
-    }
+    return _stats(await _load_dashboard_row(user_id, db, date.today()))
 
 @router.get("/activity")
 async def get_weekly_activity(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Returns daily word count and entry count for the last 7 days.
     """
     today = date.today()
-    week_ago = today - timedelta(days=6) # Include today
-    
-    # Get entries
-    entries = await db.execute(
-        select(Entry.date, Entry.word_count)
-        .where(Entry.user_id == user_id, Entry.date >= week_ago)
-        .order_by(Entry.date)
-    )
-    
-    # Process into daily map
-    data_map = { (week_ago + timedelta(days=i)): {"date": (week_ago + timedelta(days=i)).strftime("%a"), "words": 0, "entries": 0} for i in range(7) }
-    
-    for row in entries.fetchall():
-        entry_date = row.date
-        if entry_date in data_map:
-            data_map[entry_date]["words"] += row.word_count
-            data_map[entry_date]["entries"] += 1
-            
-    return list(data_map.values())
+    return _activity(await _load_dashboard_row(user_id, db, today), today)
+
+@router.get("/dashboard")
+async def get_dashboard(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Summary, stats, activity and streak together, from a single query
+    (plus one to fit topics when the user's aren't cached yet).
+    """
+    today = date.today()
+    row = await _load_dashboard_row(user_id, db, today)
+    return {
+        "summary": _summary(row, await topic_engine.top_topics(db, user_id)),
+        "stats": _stats(row),
+        "activity": _activity(row, today),
+        "streak": _streak(row, today),
+    }
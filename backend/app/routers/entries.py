@@ -1,13 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import csv
+import io
+import json
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import insert, select, func, tuple_
+from typing import List, Literal, Union
 from datetime import date
 from uuid import UUID
-from ..database import get_db
+from ..config import settings
+from ..database import ReadSessionLocal, get_db, get_read_db
 from ..models.entry import Entry, RejectionLog
-from ..schemas.entry import EntryCreate, EntryResponse
+from ..schemas.entry import (
+    EntryBulkCreate, EntryBulkResponse, EntryCreate, EntryResponse,
+    EntrySearchResult, EntrySemanticResult, EntrySummary,
+)
 from ..services.ai_validator import ai_validator
+from ..services.embedding_cache import query_embedding_cache
+from ..services.vector_search import nearest_entries
+from ..services.fingerprint import fingerprint_columns
+from ..services.user_embedding_cache import user_embedding_cache
+from ..services.topic_engine import topic_engine
+from ..services.task_queue import task_queue
+from ..services.daily_stats import record_entries_stats, record_entry_stats
+from ..services.text_search import matches, search_entries
 
 router = APIRouter(prefix="/entries", tags=["entries"])
 
@@ -18,16 +36,16 @@ async def create_entry(
     db: AsyncSession = Depends(get_db)
 ):
     # Validate with AI
-    is_valid, reason, feedback = await ai_validator.validate_entry(
+    validation = await ai_validator.validate_entry(
         entry.content, user_id, db
     )
     
-    if not is_valid:
+    if not validation.is_valid:
         # Log rejection
         rejection = RejectionLog(
             user_id=user_id,
             content=entry.content,
-            reason=reason,
+            reason=validation.reason,
             similarity_score=0.9 # Placeholder
         )
         db.add(rejection)
@@ -36,57 +54,258 @@ async def create_entry(
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail={
-                'reason': reason,
-                'feedback': feedback
+                'reason': validation.reason,
+                'feedback': validation.feedback
             }
         )
     
-    # Create entry
-    embedding = ai_validator.model.encode(entry.content)
+    # Create entry, reusing the embedding computed during the novelty check
+    embedding = validation.embedding
+    if embedding is None:
+        embedding = await ai_validator.encode(entry.content)
     
     new_entry = Entry(
         user_id=user_id,
         content=entry.content,
         embedding=embedding,
+        embedding_model_version=settings.EMBEDDING_MODEL_VERSION,
         date=entry.date,
-        word_count=len(entry.content.split())
+        word_count=len(entry.content.split()),
+        **fingerprint_columns(entry.content)
     )
     
     db.add(new_entry)
+    await db.flush()
+    await record_entry_stats(db, user_id, new_entry.date, new_entry.word_count)
+    
+    # Streak and achievement updates are committed with the entry as an
+    # outbox task and processed after the response
+    task = task_queue.enqueue(db, "entry_created", {
+        'entry_id': str(new_entry.id),
+        'user_id': str(user_id),
+        'date': new_entry.date.isoformat(),
+    })
     await db.commit()
     await db.refresh(new_entry)
+    user_embedding_cache.add(user_id, new_entry)
+    topic_engine.add(user_id, new_entry.embedding, new_entry.content)
+    await task_queue.dispatch(task, db)
+    
+    return new_entry
+
+@router.post("/bulk", response_model=EntryBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_entries_bulk(
+    payload: EntryBulkCreate,
+    user_id: UUID, # TODO: Remove this once Auth is implemented
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import many entries at once (e.g. history from another app).
+
+    Entries are validated together (one batched encode, matrix novelty
+    checks, see AIValidator.validate_batch). Accepted ones are inserted in a
+    single multi-row INSERT; rejected ones are reported by index. Streak and
+    achievements are updated once for the whole import.
+    """
+    if len(payload.entries) > settings.BULK_IMPORT_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {settings.BULK_IMPORT_MAX_ENTRIES} entries per import"
+        )
     
-    # Update streak after creating entry
-    from ..services.streak_calculator import calculate_streak
-    current_streak, longest_streak = await calculate_streak(user_id, db)
+    contents = [entry.content for entry in payload.entries]
+    results = await ai_validator.validate_batch(
+        contents, [entry.date for entry in payload.entries], user_id, db
+    )
     
-    # Check and award achievements using the gamification service
-    from ..services.gamification import gamification_service
-    await gamification_service.check_achievements(user_id, db)
+    rows, rejected = [], []
+    for index, (entry, validation) in enumerate(zip(payload.entries, results)):
+        if not validation.is_valid:
+            rejected.append({'index': index, 'reason': validation.reason, 'feedback': validation.feedback})
+            continue
+        rows.append({
+            'id': uuid.uuid4(), # Client-side ids, so the insert needs no RETURNING
+            'user_id': user_id,
+            'content': entry.content,
+            'embedding': validation.embedding,
+            'embedding_model_version': settings.EMBEDDING_MODEL_VERSION,
+            'date': entry.date,
+            'word_count': len(entry.content.split()),
+            **fingerprint_columns(entry.content)
+        })
     
-    return new_entry
+    if rows:
+        # executemany over a list of rows is sent as multi-row VALUES batches
+        await db.execute(insert(Entry), rows)
+        await record_entries_stats(db, user_id, [(row['date'], row['word_count']) for row in rows])
+        task = task_queue.enqueue(db, "entries_imported", {'user_id': str(user_id)})
+        await db.commit()
+        # Many new rows at once: reload on next use instead of appending
+        user_embedding_cache.invalidate(user_id)
+        topic_engine.invalidate(user_id)
+        await task_queue.dispatch(task, db)
+    
+    return {'created': [row['id'] for row in rows], 'rejected': rejected}
+
+def _encode_cursor(entry_date: date, entry_id: UUID) -> str:
+    return base64.urlsafe_b64encode(f"{entry_date.isoformat()}|{entry_id}".encode()).decode()
 
-@router.get("/", response_model=List[EntryResponse])
+def _decode_cursor(cursor: str):
+    try:
+        entry_date, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(entry_date), UUID(entry_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+@router.get("/", response_model=Union[List[EntryResponse], List[EntrySummary]])
 async def list_entries(
+    response: Response,
     user_id: UUID, # TODO: Remove once Auth is ready
     search: str | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    cursor: str | None = None,
+    limit: int = Query(settings.ENTRIES_PAGE_SIZE, ge=1, le=settings.ENTRIES_MAX_PAGE_SIZE),
+    view: Literal["full", "summary"] = "full",
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(Entry).where(Entry.user_id == user_id)
+    """
+    One page of the user's entries, newest first.
+
+    Pages are keyed on (date, id) so each one is an index range scan on
+    idx_user_date no matter how deep it is. When more entries remain, the
+    X-Next-Cursor header holds the cursor for the next page. view=summary
+    returns a snippet instead of the full content.
+    """
+    if view == "summary":
+        query = select(
+            Entry.id, Entry.date, Entry.word_count, Entry.created_at,
+            func.left(Entry.content, settings.ENTRY_SNIPPET_CHARS).label("snippet"),
+        )
+    else:
+        query = select(Entry)
+    query = query.where(Entry.user_id == user_id)
     
     if search:
-        # Simple case-insensitive search on content
-        query = query.where(Entry.content.ilike(f"%{search}%"))
+        # Full-text match (stemmed words), served by idx_entries_search
+        query = query.where(matches(search))
     
     if start_date:
         query = query.where(Entry.date >= start_date)
     
     if end_date:
         query = query.where(Entry.date <= end_date)
+    
+    if cursor:
+        query = query.where(tuple_(Entry.date, Entry.id) < tuple_(*_decode_cursor(cursor)))
         
-    query = query.order_by(Entry.date.desc())
+    # One extra row tells us whether there is a next page
+    query = query.order_by(Entry.date.desc(), Entry.id.desc()).limit(limit + 1)
     
     result = await db.execute(query)
-    return result.scalars().all()
+    rows = result.scalars().all() if view == "full" else result.fetchall()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1].date, rows[-1].id)
+    
+    if view == "summary":
+        return [EntrySummary.model_validate(row, from_attributes=True) for row in rows]
+    return rows
+
+@router.get("/search", response_model=List[EntrySearchResult])
+async def search_user_entries(
+    user_id: UUID, # TODO: Remove once Auth is ready
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=settings.ENTRIES_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over the user's entries, best match first, with highlighted snippets."""
+    return await search_entries(db, user_id, q, limit)
+
+@router.get("/semantic", response_model=List[EntrySemanticResult])
+async def semantic_search(
+    user_id: UUID, # TODO: Remove once Auth is ready
+    q: str = Query(..., min_length=1, max_length=500),
+    k: int = Query(settings.SEMANTIC_SEARCH_DEFAULT_K, ge=1, le=settings.SEMANTIC_SEARCH_MAX_K),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    The user's k entries closest in meaning to `q`, most similar first.
+
+    Repeated queries are embedded once (query_embedding_cache); the search
+    itself is nearest_entries with VECTOR_SEARCH_STRATEGY.
+    """
+    embedding = await ai_validator.encode(q, cache=query_embedding_cache)
+    rows = await nearest_entries(db, user_id, embedding, k=k, start_date=start_date, end_date=end_date)
+    return [
+        {
+            'id': row.id,
+            'date': row.date,
+            'word_count': row.word_count,
+            'snippet': row.content[:settings.ENTRY_SNIPPET_CHARS],
+            'score': 1 - row.distance,
+        }
+        for row in rows
+    ]
+
+EXPORT_COLUMNS = ("id", "date", "word_count", "created_at", "content")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+async def _export_chunks(db: AsyncSession, user_id: UUID, fmt: str):
+    """
+    Yield the user's entries, oldest first, as NDJSON or CSV text.
+
+    Rows come through a server-side cursor EXPORT_BATCH_SIZE at a time and
+    each batch is encoded into one chunk, so memory stays flat however long
+    the history is.
+    """
+    result = await db.stream(
+        select(*(getattr(Entry, column) for column in EXPORT_COLUMNS))
+        .where(Entry.user_id == user_id)
+        .order_by(Entry.date, Entry.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        async for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue() # Header only: the user has no entries
+    else:
+        async for rows in result.partitions():
+            yield "".join(
+                json.dumps({
+                    'id': str(row.id),
+                    'date': row.date.isoformat(),
+                    'word_count': row.word_count,
+                    'created_at': row.created_at.isoformat() if row.created_at else None,
+                    'content': row.content,
+                }) + "\n"
+                for row in rows
+            )
+
+@router.get("/export")
+async def export_entries(
+    user_id: UUID, # TODO: Remove once Auth is ready
+    format: Literal["ndjson", "csv"] = "ndjson"
+):
+    """Download the user's whole journal, streamed as NDJSON (default) or CSV."""
+    async def body():
+        # The response outlives request-scoped dependencies, so the stream
+        # owns its session
+        async with ReadSessionLocal() as db:
+            async for chunk in _export_chunks(db, user_id, format):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="journal-{date.today().isoformat()}.{format}"'},
+    )
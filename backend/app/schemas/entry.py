@@ -1,12 +1,24 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import date, datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class EntryCreate(BaseModel):
     content: str = Field(..., min_length=10, max_length=2000)
     date: date
 
+class EntryBulkCreate(BaseModel):
+    entries: List[EntryCreate] = Field(..., min_length=1)
+
+class EntryBulkRejection(BaseModel):
+    index: int # Position in the submitted entries
+    reason: str
+    feedback: str
+
+class EntryBulkResponse(BaseModel):
+    created: List[UUID]
+    rejected: List[EntryBulkRejection]
+
 class EntryResponse(BaseModel):
     id: UUID
     content: str
@@ -18,3 +30,25 @@ class EntryResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class EntrySearchResult(BaseModel):
+    id: UUID
+    date: date
+    word_count: int
+    rank: float
+    headline: str # Matching fragments, with matches wrapped in <mark>
+
+class EntrySemanticResult(BaseModel):
+    id: UUID
+    date: date
+    word_count: int
+    snippet: str
+    score: float # Cosine similarity to the query, higher is closer
+
+class EntrySummary(BaseModel):
+    """Lightweight list item (view=summary): no full content or metadata."""
+    id: UUID
+    date: date
+    word_count: int
+    snippet: str
+    created_at: datetime
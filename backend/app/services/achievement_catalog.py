@@ -0,0 +1,74 @@
+import asyncio
+from typing import Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.achievement import Achievement
+
+
+class CatalogItem(NamedTuple):
+    id: UUID
+    name: str
+    description: str
+    icon_name: str
+    criteria: str
+
+
+class AchievementCatalog:
+    """
+    Process-wide copy of the (small, static) achievements table.
+
+    Loaded once at startup after seeding. Anything that changes the table
+    must call invalidate(); the next lookup then reloads it. Items are plain
+    tuples rather than ORM objects so they outlive the loading session.
+    """
+
+    def __init__(self):
+        self._items: Optional[List[CatalogItem]] = None
+        self._by_criteria: Dict[str, CatalogItem] = {}
+        self._by_id: Dict[UUID, CatalogItem] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._items is not None
+
+    async def load(self, db: AsyncSession) -> List[CatalogItem]:
+        result = await db.execute(
+            select(
+                Achievement.id, Achievement.name, Achievement.description,
+                Achievement.icon_name, Achievement.criteria,
+            )
+        )
+        items = [CatalogItem(*row) for row in result.fetchall()]
+        self._by_criteria = {item.criteria: item for item in items}
+        self._by_id = {item.id: item for item in items}
+        self._items = items
+        return items
+
+    async def all(self, db: AsyncSession) -> List[CatalogItem]:
+        """Every achievement, loading the catalog first if needed."""
+        if self._items is None:
+            async with self._lock:
+                if self._items is None:
+                    await self.load(db)
+        return self._items
+
+    async def by_criteria(self, db: AsyncSession, criteria: str) -> Optional[CatalogItem]:
+        await self.all(db)
+        return self._by_criteria.get(criteria)
+
+    async def by_id(self, db: AsyncSession, achievement_id: UUID) -> Optional[CatalogItem]:
+        await self.all(db)
+        return self._by_id.get(achievement_id)
+
+    def invalidate(self):
+        self._items = None
+        self._by_criteria = {}
+        self._by_id = {}
+
+
+# Singleton instance
+achievement_catalog = AchievementCatalog()
@@ -1,11 +1,38 @@
-from sentence_transformers import SentenceTransformer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import select, text
 from uuid import UUID
 import numpy as np
-import re
-from typing import Tuple, Dict, Optional
-from datetime import datetime
+import threading
+from typing import Tuple, Dict, List, NamedTuple, Optional, Any, Sequence
+from datetime import date, datetime
+from dataclasses import dataclass, field
+
+from ..config import settings
+from ..models.entry import Entry
+from .embedding_backends import load_embedding_model
+from .embedding_executor import embedding_executor, EmbeddingPoolSaturated
+from .embedding_batcher import embedding_batcher
+from .embedding_cache import EmbeddingCache, embedding_cache
+from .vector_search import nearest_entries, normalize_rows
+from .user_embedding_cache import user_embedding_cache
+from .generic_analyzer import analyze_generic
+from .fingerprint import content_fingerprint, simhash, simhash_bands, hamming_distance, SIMHASH_BITS
+
+@dataclass
+class ValidationResult:
+    """Outcome of validate_entry, carrying the work done so callers can reuse it."""
+    is_valid: bool
+    reason: str
+    feedback: str
+    embedding: Optional[np.ndarray] = None
+    analysis: Dict[str, Any] = field(default_factory=dict)
+
+
+class _BatchMatch(NamedTuple):
+    """An earlier entry of the same import, shaped for _similarity_feedback."""
+    date: date
+    content: str
+
 
 class AIValidator:
     _instance = None
@@ -14,24 +41,88 @@ class AIValidator:
         if cls._instance is None:
             cls._instance = super(AIValidator, cls).__new__(cls)
             cls._instance._model = None # Lazy load storage
+            cls._instance._model_lock = threading.Lock()
+            cls._instance.warmed_up = False
             cls._instance.similarity_threshold = 0.85
             cls._instance.min_word_count = 15  # Increased from 10 for more substance
+            cls._instance.simhash_max_distance = 6  # Bits; must stay below SIMHASH_BANDS
         return cls._instance
 
     @property
     def model(self):
         if self._model is None:
-            print("[AIValidator] Loading embedding model (lazy)...")
-            self._model = SentenceTransformer('all-MiniLM-L6-v2')
-            print("[AIValidator] Model loaded.")
+            # Single-flight: concurrent first callers wait for one load
+            with self._model_lock:
+                if self._model is None:
+                    print(f"[AIValidator] Loading embedding model (lazy, {settings.EMBEDDING_BACKEND} backend)...")
+                    self._model = load_embedding_model(
+                        settings.EMBEDDING_MODEL_NAME,
+                        settings.EMBEDDING_BACKEND,
+                        settings.EMBEDDING_ONNX_FILE,
+                    )
+                    print("[AIValidator] Model loaded.")
         return self._model
 
+    async def warm_up(self):
+        """Load the model in every embedding worker ahead of the first request."""
+        await embedding_executor.warm_up()
+        self.warmed_up = True
+
+    async def encode(self, content: str, cache: EmbeddingCache = embedding_cache) -> np.ndarray:
+        """
+        Embed a single text without blocking the event loop.
+
+        Texts already seen (after normalization) are served from `cache`,
+        the entry embedding cache by default. Concurrent misses are coalesced into one batched
+        encode when EMBEDDING_BATCHING_ENABLED is set.
+
+        Raises:
+            EmbeddingPoolSaturated: if the embedding pool is at capacity
+        """
+        cached = cache.get(content)
+        if cached is not None:
+            return cached
+
+        if settings.EMBEDDING_BATCHING_ENABLED:
+            embedding = await embedding_batcher.encode(content)
+        else:
+            embedding = (await embedding_executor.encode([content]))[0]
+
+        cache.put(content, embedding)
+        return embedding
+
+    async def encode_batch(self, contents: Sequence[str], cache: EmbeddingCache = embedding_cache) -> np.ndarray:
+        """
+        Embed many texts at once, one row per text.
+
+        Cached texts are skipped and the distinct misses go to the pool as a
+        single job, bypassing the micro-batcher (the batch is already formed).
+
+        Raises:
+            EmbeddingPoolSaturated: if the embedding pool is at capacity
+        """
+        embeddings: List[Optional[np.ndarray]] = [cache.get(content) for content in contents]
+        misses: Dict[str, List[int]] = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                misses.setdefault(cache.key(contents[i]), []).append(i)
+
+        if misses:
+            positions = list(misses.values())
+            encoded = await embedding_executor.encode([contents[indices[0]] for indices in positions])
+            for indices, embedding in zip(positions, encoded):
+                cache.put(contents[indices[0]], embedding)
+                for i in indices:
+                    embeddings[i] = embedding
+
+        return np.stack(embeddings) if embeddings else np.empty((0, 0), dtype=np.float32)
+
     async def validate_entry(
         self, 
         content: str, 
         user_id: UUID, 
         db: AsyncSession
-    ) -> Tuple[bool, str, str]:
+    ) -> ValidationResult:
         """
         Validates a journal entry for authenticity, specificity, and novelty.
         
@@ -41,12 +132,13 @@ class AIValidator:
             db: Async database session
             
         Returns:
-            Tuple of (is_valid: bool, reason: str, feedback: str)
+            ValidationResult with the verdict, plus the heuristic analysis and
+            the content embedding when they were computed
         """
         # 1. Length validation
         word_count = len(content.split())
         if word_count < self.min_word_count:
-            return (
+            return ValidationResult(
                 False, 
                 'too_short', 
                 f'Please write at least {self.min_word_count} words to capture meaningful reflection (currently {word_count}).'
@@ -56,74 +148,231 @@ class AIValidator:
         is_generic, analysis = self._is_generic(content)
         if is_generic:
             feedback = self._generate_generic_feedback(analysis)
-            return False, 'generic', feedback
+            return ValidationResult(False, 'generic', feedback, analysis=analysis)
         
         # 3. Novelty check via semantic similarity
-        is_novel, similarity_feedback = await self._check_novelty(content, user_id, db)
+        is_novel, similarity_feedback, embedding = await self._check_novelty(content, user_id, db)
         if not is_novel:
-            return False, 'duplicate', similarity_feedback
+            return ValidationResult(False, 'duplicate', similarity_feedback, embedding, analysis)
             
-        return True, 'accepted', ''
+        return ValidationResult(True, 'accepted', '', embedding, analysis)
     
+    async def validate_batch(
+        self,
+        contents: Sequence[str],
+        dates: Sequence[date],
+        user_id: UUID,
+        db: AsyncSession
+    ) -> List[ValidationResult]:
+        """
+        Validate a batch of entries (e.g. an import), one result per entry.
+
+        Same rules as validate_entry, but the model runs once for the whole
+        batch and novelty is decided with similarity matrices: against the
+        user's existing entries (streamed in chunks) and against earlier
+        accepted entries of the same batch. The fingerprint lookup is
+        skipped; exact repeats score ~1.0 on embeddings anyway.
+
+        Raises:
+            EmbeddingPoolSaturated: if the embedding pool is at capacity
+        """
+        results: List[Optional[ValidationResult]] = [None] * len(contents)
+        candidates, analyses = [], {}
+        for i, content in enumerate(contents):
+            word_count = len(content.split())
+            if word_count < self.min_word_count:
+                results[i] = ValidationResult(
+                    False,
+                    'too_short',
+                    f'Please write at least {self.min_word_count} words to capture meaningful reflection (currently {word_count}).'
+                )
+                continue
+            is_generic, analysis = self._is_generic(content)
+            if is_generic:
+                results[i] = ValidationResult(False, 'generic', self._generate_generic_feedback(analysis), analysis=analysis)
+                continue
+            candidates.append(i)
+            analyses[i] = analysis
+
+        if not candidates:
+            return results
+
+        embeddings = await self.encode_batch([contents[i] for i in candidates])
+        normalized = normalize_rows(embeddings)
+        try:
+            # A savepoint, so a failed scan leaves the caller's transaction usable
+            async with db.begin_nested():
+                existing_similarity, existing_rows = await self._nearest_existing(normalized, user_id, db)
+        except Exception as e:
+            # Fail open, as validate_entry does when vector search fails
+            print(f"[AIValidator] Batch novelty scan error: {e}")
+            existing_similarity, existing_rows = np.full(len(candidates), -1.0), [None] * len(candidates)
+
+        within = normalized @ normalized.T
+        accepted = np.zeros(len(candidates), dtype=bool)
+        for j, i in enumerate(candidates):
+            if existing_similarity[j] >= self.similarity_threshold:
+                feedback = self._similarity_feedback(float(existing_similarity[j]), existing_rows[j])
+                results[i] = ValidationResult(False, 'duplicate', feedback, embeddings[j], analyses[i])
+                continue
+
+            earlier = np.where(accepted[:j], within[j, :j], -1.0)
+            best = int(np.argmax(earlier)) if j else -1
+            if best >= 0 and earlier[best] >= self.similarity_threshold:
+                match = _BatchMatch(dates[candidates[best]], contents[candidates[best]])
+                feedback = self._similarity_feedback(float(earlier[best]), match)
+                results[i] = ValidationResult(False, 'duplicate', feedback, embeddings[j], analyses[i])
+                continue
+
+            accepted[j] = True
+            results[i] = ValidationResult(True, 'accepted', '', embeddings[j], analyses[i])
+
+        return results
+
+    async def _nearest_existing(
+        self,
+        normalized: np.ndarray,
+        user_id: UUID,
+        db: AsyncSession
+    ) -> Tuple[np.ndarray, List]:
+        """
+        Best cosine similarity of each row to the user's stored entries, and
+        the matching (date, content) row, in one streamed pass over history.
+        """
+        best = np.full(len(normalized), -1.0, dtype=np.float32)
+        rows: List = [None] * len(normalized)
+        result = await db.stream(
+            select(Entry.date, Entry.content, Entry.embedding)
+            .where(Entry.user_id == user_id, Entry.embedding_model_version == settings.EMBEDDING_MODEL_VERSION)
+            .execution_options(yield_per=settings.BULK_IMPORT_SCAN_BATCH_SIZE)
+        )
+        async for chunk in result.partitions():
+            similarities = normalized @ normalize_rows(np.stack([np.asarray(row.embedding) for row in chunk])).T
+            top = similarities.argmax(axis=1)
+            scores = similarities[np.arange(len(normalized)), top]
+            for j in np.flatnonzero(scores > best):
+                best[j] = scores[j]
+                rows[j] = chunk[top[j]]
+        return best, rows
+
     async def _check_novelty(
         self, 
         content: str, 
         user_id: UUID, 
         db: AsyncSession
-    ) -> Tuple[bool, str]:
+    ) -> Tuple[bool, str, Optional[np.ndarray]]:
         """
         Check if entry is semantically novel compared to previous entries.
         
         Returns:
-            Tuple of (is_novel: bool, feedback: str)
+            Tuple of (is_novel: bool, feedback: str, embedding), where embedding
+            is None only if encoding itself failed
         """
+        # Exact and near-exact repeats are caught without touching the model.
+        # Lookups run in savepoints: a failure is rolled back without touching
+        # whatever the caller has pending on the session.
         try:
-            embedding = self.model.encode(content)
-            
-            # Query for most similar entry
-            query = text("""
-                SELECT id, date, content, (embedding <=> CAST(:embedding AS vector)) as distance
-                FROM entries
-                WHERE user_id = :user_id
-                ORDER BY distance ASC
-                LIMIT 1
-            """)
+            async with db.begin_nested():
+                duplicate_feedback = await self._find_text_duplicate(content, user_id, db)
+            if duplicate_feedback:
+                return False, duplicate_feedback, None
+        except Exception as e:
+            print(f"[AIValidator] Fingerprint lookup error: {e}")
+        
+        embedding = None
+        try:
+            embedding = await self.encode(content)
             
-            result = await db.execute(query, {
-                'embedding': str(embedding.tolist()),
-                'user_id': user_id
-            })
-            row = result.fetchone()
+            # Most similar earlier entry, in memory when the user is cacheable
+            async with db.begin_nested():
+                rows = None
+                if settings.USER_EMBEDDING_CACHE_ENABLED:
+                    rows = await user_embedding_cache.nearest(db, user_id, embedding, k=1)
+                if rows is None:
+                    rows = await nearest_entries(db, user_id, embedding, k=1)
+            row = rows[0] if rows else None
             
             if row:
                 distance = row.distance
                 similarity = 1 - distance
                 
                 if similarity >= self.similarity_threshold:
-                    # Format the date nicely
-                    entry_date = row.date
-                    if isinstance(entry_date, datetime):
-                        date_str = entry_date.strftime('%B %d, %Y')
-                    else:
-                        date_str = str(entry_date)
-                    
-                    # Provide context and actionable feedback
-                    similar_snippet = row.content[:50] + "..." if len(row.content) > 50 else row.content
-                    
-                    feedback = (
-                        f"This entry is {similarity:.0%} similar to your entry from {date_str}:\n\n"
-                        f'"{similar_snippet}"\n\n'
-                        f"Try exploring: What's different today? What new angle or insight can you add?"
-                    )
-                    return False, feedback
+                    return False, self._similarity_feedback(similarity, row), embedding
                     
+        except EmbeddingPoolSaturated:
+            # Backpressure must reach the caller rather than fail open
+            raise
         except Exception as e:
             # Fail open: Allow entry if vector search fails, but log for monitoring
             print(f"[AIValidator] Vector search error: {e}")
             # In production, consider logging to a proper logger
             # logger.warning(f"Vector search failed for user {user_id}: {e}")
             
-        return True, ''
+        return True, '', embedding
+    
+    async def _find_text_duplicate(
+        self, 
+        content: str, 
+        user_id: UUID, 
+        db: AsyncSession
+    ) -> Optional[str]:
+        """
+        Look up byte-identical (after normalization) or trivially reworded
+        earlier entries via the indexed fingerprint and SimHash band columns.
+        
+        Band collisions are common in long histories, so the Hamming distance
+        is filtered and ordered in SQL and only the closest match comes back.
+        
+        Returns:
+            Rejection feedback if a duplicate exists, otherwise None
+        """
+        fingerprint = content_fingerprint(content)
+        signature = simhash(content)
+        
+        query = text("""
+            SELECT date, content, content_fingerprint, simhash
+            FROM entries
+            WHERE user_id = :user_id
+              AND (content_fingerprint = :fingerprint
+                   OR (simhash_bands && CAST(:bands AS integer[])
+                       AND bit_count(CAST(simhash # :signature AS bit(64))) <= :max_distance))
+            ORDER BY (content_fingerprint = :fingerprint) DESC,
+                     bit_count(CAST(simhash # :signature AS bit(64))) ASC
+            LIMIT 1
+        """)
+        result = await db.execute(query, {
+            'user_id': user_id,
+            'fingerprint': fingerprint,
+            'bands': simhash_bands(signature),
+            'signature': signature,
+            'max_distance': self.simhash_max_distance,
+        })
+        
+        row = result.fetchone()
+        if row is None:
+            return None
+        if row.content_fingerprint == fingerprint:
+            return self._similarity_feedback(1.0, row)
+        distance = hamming_distance(signature, row.simhash)
+        return self._similarity_feedback(1 - distance / SIMHASH_BITS, row)
+    
+    def _similarity_feedback(self, similarity: float, row) -> str:
+        """Explain which earlier entry this one repeats."""
+        # Format the date nicely
+        entry_date = row.date
+        if isinstance(entry_date, datetime):
+            date_str = entry_date.strftime('%B %d, %Y')
+        else:
+            date_str = str(entry_date)
+        
+        # Provide context and actionable feedback
+        similar_snippet = row.content[:50] + "..." if len(row.content) > 50 else row.content
+        
+        return (
+            f"This entry is {similarity:.0%} similar to your entry from {date_str}:\n\n"
+            f'"{similar_snippet}"\n\n'
+            f"Try exploring: What's different today? What new angle or insight can you add?"
+        )
     
     def _is_generic(self, content: str) -> Tuple[bool, Dict[str, any]]:
         """
@@ -132,153 +381,7 @@ class AIValidator:
         Returns:
             Tuple of (is_generic: bool, analysis_details: dict)
         """
-        # Categorized generic phrases with severity weights
-        generic_phrases = {
-            'platitudes': [
-                'never give up', 'hard work pays off', 'believe in yourself',
-                'stay positive', 'think positive', 'positive vibes', 'good vibes',
-                'everything happens for a reason', 'live laugh love', 'follow your dreams',
-                'you miss 100% of the shots', 'rome wasn\'t built in a day',
-                'practice makes perfect', 'time heals all wounds'
-            ],
-            'vague_statements': [
-                'learned a lot', 'learned so much', 'was interesting', 'really cool',
-                'pretty good', 'went well', 'didn\'t go well', 'had fun',
-                'was productive', 'made progress', 'getting better', 'doing well'
-            ],
-            'surface_observations': [
-                'good day', 'bad day', 'tough day', 'long day', 'busy day',
-                'great experience', 'interesting experience', 'life lesson',
-                'success is', 'failure is', 'the key is', 'important to'
-            ]
-        }
-        
-        content_lower = content.lower()
-        words = content.split()
-        word_count = len(words)
-        
-        # Initialize scoring
-        specificity_score = 0
-        generic_score = 0
-        
-        # 1. GENERIC PHRASE DETECTION (weighted by severity)
-        phrase_matches = []
-        for category, phrases in generic_phrases.items():
-            for phrase in phrases:
-                if phrase in content_lower:
-                    weight = 2 if category == 'platitudes' else 1
-                    generic_score += weight
-                    phrase_matches.append((phrase, category))
-        
-        # 2. SPECIFICITY INDICATORS
-        
-        # Named entities (improved proper noun detection)
-        proper_nouns = []
-        for i, word in enumerate(words):
-            cleaned = word.strip(".,!?;:\"'")
-            if (i > 0 and 
-                cleaned and 
-                len(cleaned) > 1 and
-                cleaned[0].isupper() and 
-                cleaned.lower() not in ['i', 'the', 'a', 'an', 'it', 'this', 'that', 'these', 'those']):
-                proper_nouns.append(cleaned)
-                specificity_score += 1
-        
-        # Numbers and quantitative data
-        numbers = re.findall(r'\d+', content)
-        if numbers:
-            specificity_score += len(numbers)
-        
-        # Time expressions (temporal specificity)
-        time_patterns = [
-            r'\d{1,2}:\d{2}',  # 3:45
-            r'\d{1,2}\s?(am|pm)',  # 3pm
-            r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
-            r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\b',
-            r'(this\s)?(morning|afternoon|evening|night)',
-            r'for \d+ (minute|hour|day|week)s?',
-            r'(yesterday|today|tonight|last\s\w+)'
-        ]
-        time_matches = sum(1 for pattern in time_patterns if re.search(pattern, content_lower))
-        specificity_score += time_matches * 2
-        
-        # Concrete action verbs (past tense indicating actual actions)
-        action_verbs = [
-            'implemented', 'debugged', 'refactored', 'analyzed', 'discovered',
-            'tested', 'wrote', 'built', 'created', 'designed', 'solved',
-            'practiced', 'completed', 'reviewed', 'studied', 'experimented',
-            'measured', 'calculated', 'researched', 'interviewed', 'presented',
-            'noticed', 'realized', 'figured out', 'identified', 'attempted'
-        ]
-        action_count = sum(1 for verb in action_verbs if verb in content_lower)
-        specificity_score += action_count * 2
-        
-        # Quoted text or specific dialogue
-        quotes = re.findall(r'["\']([^"\']{3,})["\']', content)
-        if quotes:
-            specificity_score += len(quotes) * 2
-        
-        # 3. RED FLAGS
-        
-        # Vague learning statements
-        if re.search(r'\blearned (that|about|how)\b', content_lower):
-            # Check if there's substantial follow-up
-            learned_pos = content_lower.find('learned')
-            remaining = content_lower[learned_pos:]
-            if len(remaining.split()) < 15:  # Not much substance after "learned"
-                generic_score += 1
-        
-        # Excessive intensifiers without substance
-        intensifiers = ['very', 'really', 'extremely', 'super', 'so', 'quite']
-        intensifier_count = sum(1 for word in words if word.lower() in intensifiers)
-        if intensifier_count >= 3 and word_count < 50:
-            generic_score += 1
-        
-        # Calculate specificity ratio
-        specificity_ratio = specificity_score / word_count if word_count > 0 else 0
-        
-        # 4. ANALYSIS SUMMARY
-        analysis = {
-            'word_count': word_count,
-            'generic_score': generic_score,
-            'specificity_score': specificity_score,
-            'specificity_ratio': specificity_ratio,
-            'proper_nouns': len(proper_nouns),
-            'numbers': len(numbers),
-            'time_references': time_matches,
-            'action_verbs': action_count,
-            'phrase_matches': phrase_matches
-        }
-        
-        # 5. DECISION LOGIC (graduated thresholds by length)
-        is_generic = False
-        
-        # Critical: Multiple generic phrases with minimal specifics
-        if generic_score >= 3 and specificity_score < 2:
-            is_generic = True
-        
-        # High generic language with low specificity ratio
-        elif generic_score >= 2 and specificity_ratio < 0.12:
-            is_generic = True
-        
-        # Short entries (< 30 words)
-        elif word_count < 30:
-            if generic_score >= 1 and specificity_score == 0:
-                is_generic = True
-            elif generic_score > 0 and specificity_ratio < 0.1:
-                is_generic = True
-        
-        # Medium entries (30-100 words)
-        elif 30 <= word_count < 100:
-            if generic_score >= 2 and specificity_score < 3:
-                is_generic = True
-        
-        # Longer entries (100+ words)
-        elif word_count >= 100:
-            if generic_score >= 3 and specificity_ratio < 0.08:
-                is_generic = True
-        
-        return is_generic, analysis
+        return analyze_generic(content)
     
     def _generate_generic_feedback(self, analysis: Dict[str, any]) -> str:
         """
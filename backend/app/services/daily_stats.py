@@ -0,0 +1,84 @@
+from datetime import date
+from typing import Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Both rollups in one round trip; runs inside the caller's entry transaction
+_RECORD_ENTRY = text("""
+    WITH day AS (
+        INSERT INTO user_daily_stats (user_id, date, entry_count, word_count)
+        VALUES (:user_id, :date, 1, :word_count)
+        ON CONFLICT (user_id, date) DO UPDATE
+        SET entry_count = user_daily_stats.entry_count + 1,
+            word_count = user_daily_stats.word_count + EXCLUDED.word_count
+    )
+    INSERT INTO user_stats_totals (user_id, entry_count, word_count)
+    VALUES (:user_id, 1, :word_count)
+    ON CONFLICT (user_id) DO UPDATE
+    SET entry_count = user_stats_totals.entry_count + 1,
+        word_count = user_stats_totals.word_count + EXCLUDED.word_count
+""")
+
+# Many entries of one user at once (bulk import), pre-aggregated per date
+_RECORD_ENTRIES = text("""
+    WITH new AS (
+        SELECT date, word_count
+        FROM unnest(CAST(:dates AS date[]), CAST(:word_counts AS integer[])) AS t(date, word_count)
+    ), day AS (
+        INSERT INTO user_daily_stats (user_id, date, entry_count, word_count)
+        SELECT :user_id, date, count(*), sum(word_count)
+        FROM new
+        GROUP BY date
+        ON CONFLICT (user_id, date) DO UPDATE
+        SET entry_count = user_daily_stats.entry_count + EXCLUDED.entry_count,
+            word_count = user_daily_stats.word_count + EXCLUDED.word_count
+    )
+    INSERT INTO user_stats_totals (user_id, entry_count, word_count)
+    SELECT :user_id, count(*), sum(word_count)
+    FROM new
+    ON CONFLICT (user_id) DO UPDATE
+    SET entry_count = user_stats_totals.entry_count + EXCLUDED.entry_count,
+        word_count = user_stats_totals.word_count + EXCLUDED.word_count
+""")
+
+# Rebuild both rollups for every user from `entries` (idempotent)
+BACKFILL_STATEMENTS = [
+    """
+    INSERT INTO user_daily_stats (user_id, date, entry_count, word_count)
+    SELECT user_id, date, count(*), coalesce(sum(word_count), 0)
+    FROM entries
+    GROUP BY user_id, date
+    ON CONFLICT (user_id, date) DO UPDATE
+    SET entry_count = EXCLUDED.entry_count, word_count = EXCLUDED.word_count
+    """,
+    """
+    INSERT INTO user_stats_totals (user_id, entry_count, word_count)
+    SELECT user_id, count(*), coalesce(sum(word_count), 0)
+    FROM entries
+    GROUP BY user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET entry_count = EXCLUDED.entry_count, word_count = EXCLUDED.word_count
+    """,
+]
+
+
+async def record_entry_stats(db: AsyncSession, user_id: UUID, entry_date: date, word_count: int):
+    """Add one entry to the user's daily and lifetime rollups (caller commits)."""
+    await db.execute(
+        _RECORD_ENTRY,
+        {'user_id': user_id, 'date': entry_date, 'word_count': word_count},
+    )
+
+
+async def record_entries_stats(db: AsyncSession, user_id: UUID, entries: Sequence[Tuple[date, int]]):
+    """Add many (date, word_count) entries to the rollups in one statement (caller commits)."""
+    await db.execute(
+        _RECORD_ENTRIES,
+        {
+            'user_id': user_id,
+            'dates': [entry_date for entry_date, _ in entries],
+            'word_counts': [word_count for _, word_count in entries],
+        },
+    )
@@ -0,0 +1,37 @@
+from sentence_transformers import SentenceTransformer
+
+EMBEDDING_BACKENDS = ("torch", "torch_int8", "onnx", "onnx_int8")
+
+
+def load_embedding_model(model_name: str, backend: str, onnx_file: str | None = None):
+    """
+    Build the embedding model for the configured inference backend.
+
+    Every backend returns a SentenceTransformer, so callers keep using
+    `model.encode(...)` regardless of which one is selected:
+        torch: the reference PyTorch model
+        torch_int8: PyTorch with Linear layers dynamically quantized to int8
+        onnx: ONNX Runtime export of the model
+        onnx_int8: a pre-quantized ONNX file from the model repo (onnx_file)
+
+    The onnx backends need `optimum[onnxruntime]` installed.
+    """
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    if backend == "torch_int8":
+        import torch
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+
+    if backend == "onnx_int8":
+        return SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={"file_name": onnx_file},
+        )
+
+    raise ValueError(f"Unknown embedding backend: {backend!r}")
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Awaitable, Callable, List, Set, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .embedding_executor import embedding_executor
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text encode requests into batched model calls.
+
+    Requests are collected until either max_batch_size texts are waiting or
+    max_wait_ms has passed since the first one arrived; the whole batch is then
+    encoded in one call and each caller's future is resolved with its own row.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], Awaitable[np.ndarray]],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ):
+        self._encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._waiting: List[Tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # The event loop only keeps weak references to tasks, so a batch task
+        # could be garbage-collected mid-flight and its callers never resolved
+        self._running: Set[asyncio.Task] = set()
+
+    async def encode(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiting.append((text, future))
+
+        if len(self._waiting) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._waiting = self._waiting, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        # Identical texts in the same window only need to be encoded once
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = await self._encode_batch(unique_texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        rows = dict(zip(unique_texts, embeddings))
+        for text, future in batch:
+            # The caller may have been cancelled (e.g. client disconnected)
+            if not future.done():
+                future.set_result(rows[text])
+
+
+# Singleton instance
+embedding_batcher = EmbeddingBatcher(
+    encode_batch=embedding_executor.encode,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+)
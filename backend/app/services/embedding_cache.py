@@ -0,0 +1,119 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..config import settings
+from .fingerprint import normalize_content
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of embeddings keyed by a hash of the normalized content.
+
+    Keys are namespaced by model name so vectors from different models never
+    mix. When cache_dir is set, entries are also written there as .npy files
+    and survive restarts; the in-memory LRU stays the first lookup.
+    """
+
+    def __init__(self, model_name: str, max_entries: int, cache_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max(0, max_entries)
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, content: str) -> str:
+        payload = f"{self.model_name}\0{normalize_content(content)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, content: str) -> Optional[np.ndarray]:
+        key = self.key(content)
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+        else:
+            embedding = self._load(key)
+            if embedding is not None:
+                self._remember(key, embedding)
+
+        if embedding is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return embedding
+
+    def put(self, content: str, embedding: np.ndarray):
+        key = self.key(content)
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        self._remember(key, embedding)
+        self._store(key, embedding)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remember(self, key: str, embedding: np.ndarray):
+        if self.max_entries == 0:
+            return
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        if not self.cache_dir:
+            return None
+        try:
+            embedding = np.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+        embedding.flags.writeable = False
+        return embedding
+
+    def _store(self, key: str, embedding: np.ndarray):
+        if not self.cache_dir:
+            return
+        try:
+            # Write then rename so concurrent workers never read a partial file
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, embedding)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"[EmbeddingCache] Failed to persist embedding: {e}")
+
+
+# Quantized backends produce slightly different vectors, so keep them apart
+_MODEL_KEY = f"{settings.EMBEDDING_MODEL_NAME}/{settings.EMBEDDING_BACKEND}"
+
+# Singleton instances
+embedding_cache = EmbeddingCache(
+    model_name=_MODEL_KEY,
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    cache_dir=settings.EMBEDDING_CACHE_DIR,
+)
+# Semantic search queries: short and often repeated, so a burst of searches
+# doesn't evict entry embeddings (memory only)
+query_embedding_cache = EmbeddingCache(
+    model_name=_MODEL_KEY,
+    max_entries=settings.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from ..config import settings
+
+
+class EmbeddingPoolSaturated(Exception):
+    """Raised when the embedding pool already has its maximum number of pending jobs."""
+
+
+def _encode_with_validator_model(texts: List[str]) -> np.ndarray:
+    """
+    Encode texts with the AIValidator model.
+
+    Runs inside a pool worker. In thread mode this resolves to the shared
+    singleton; in process mode every worker process lazily builds its own.
+    """
+    from .ai_validator import ai_validator
+    return ai_validator.model.encode(texts)
+
+
+class EmbeddingExecutor:
+    """
+    Runs SentenceTransformer encoding off the event loop.
+
+    The number of in-flight jobs (running + queued) is bounded so that a burst
+    of submissions fails fast with EmbeddingPoolSaturated instead of piling up
+    behind the model and stalling every other request on the worker.
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_pending: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown embedding executor kind: {kind!r}")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self._pending = 0
+        self._pool: Executor | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="embedding",
+                )
+        return self._pool
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode a list of texts in the pool, returning one row per text."""
+        if self._pending >= self.max_pending:
+            raise EmbeddingPoolSaturated(
+                f"Embedding pool is saturated ({self._pending} pending jobs)"
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_pool(), _encode_with_validator_model, texts
+            )
+        finally:
+            self._pending -= 1
+
+    async def warm_up(self):
+        """Run one job per worker so each has loaded the model (not counted as pending)."""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _encode_with_validator_model, ["warm up"])
+            for _ in range(self.max_workers)
+        ))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Singleton instance
+embedding_executor = EmbeddingExecutor(
+    kind=settings.EMBEDDING_EXECUTOR,
+    max_workers=settings.EMBEDDING_WORKERS,
+    max_pending=settings.EMBEDDING_MAX_PENDING,
+)
@@ -0,0 +1,77 @@
+import hashlib
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> str:
+    """
+    Canonical form of entry text: lowercased with whitespace runs collapsed.
+
+    all-MiniLM-L6-v2 uses an uncased tokenizer and ignores spacing, so texts
+    that normalize identically produce the same embedding.
+    """
+    return _WHITESPACE.sub(" ", content).strip().lower()
+
+
+def content_fingerprint(content: str) -> str:
+    """SHA-256 hex digest of the normalized content."""
+    return hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+
+
+_TOKEN = re.compile(r"\w+")
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(content: str) -> int:
+    """
+    64-bit SimHash over the word tokens of the normalized content.
+
+    Texts that differ by punctuation, word order or a swapped word land within
+    a few bits of each other. Word n-grams were too sensitive for entries of
+    a few dozen words. Returned as a signed integer so it fits a Postgres BIGINT.
+    """
+    weights = [0] * SIMHASH_BITS
+    for feature in _TOKEN.findall(normalize_content(content)):
+        h = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    value = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def simhash_bands(value: int) -> list[int]:
+    """
+    Split a SimHash into tagged 8-bit bands for GIN-indexed candidate lookup.
+
+    Two hashes within Hamming distance < SIMHASH_BANDS share at least one
+    band, so an array-overlap query finds every near-duplicate candidate.
+    """
+    unsigned = value & ((1 << SIMHASH_BITS) - 1)
+    return [
+        (band << _BAND_BITS) | (unsigned >> (band * _BAND_BITS) & _BAND_MASK)
+        for band in range(SIMHASH_BANDS)
+    ]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return ((a ^ b) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+
+def fingerprint_columns(content: str) -> dict:
+    """Values for the Entry duplicate-detection columns."""
+    signature = simhash(content)
+    return {
+        "content_fingerprint": content_fingerprint(content),
+        "simhash": signature,
+        "simhash_bands": simhash_bands(signature),
+    }
@@ -1,58 +1,89 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from typing import Callable, Dict, List, NamedTuple, Set
 from uuid import UUID
-from ..models.achievement import Achievement, UserAchievement
+from ..models.achievement import UserAchievement
 from ..models.streak import StreakData
 from ..models.entry import Entry
+from .achievement_catalog import achievement_catalog
+
+
+class UserStats(NamedTuple):
+    current_streak: int
+    entry_count: int
+    total_words: int
+
+
+# Achievement criteria code -> condition on the user's stats
+ACHIEVEMENT_RULES: Dict[str, Callable[[UserStats], bool]] = {
+    "FIRST_STEP": lambda s: True, # Always unlock on first check if they have an entry (assumed called after entry)
+    "STREAK_3": lambda s: s.current_streak >= 3,
+    "STREAK_7": lambda s: s.current_streak >= 7,
+    "STREAK_30": lambda s: s.current_streak >= 30,
+    "WORDS_1000": lambda s: s.total_words >= 1000,
+    "ENTRIES_10": lambda s: s.entry_count >= 10,
+}
+
+
+def evaluate_rules(stats: UserStats) -> Set[str]:
+    """Criteria codes whose conditions the stats satisfy."""
+    return {code for code, condition in ACHIEVEMENT_RULES.items() if condition(stats)}
+
 
 class GamificationService:
-    async def check_achievements(self, user_id: UUID, db: AsyncSession):
+    async def check_achievements(self, user_id: UUID, db: AsyncSession, commit: bool = True) -> List[str]:
         """
         Check and unlock achievements based on user activity.
         This should be called after critical actions (e.g. creating an entry).
+
+        Reads the user's stats and unlocked set in one query each, evaluates
+        every rule in memory against the cached catalog, and inserts all new
+        unlocks in a single statement. Returns the newly unlocked names.
+        With commit=False the caller commits (the task queue does, with the task).
         """
         # 1. Get User Data
-        streak_data = await db.scalar(select(StreakData).where(StreakData.user_id == user_id))
-        entry_count = await db.scalar(select(func.count()).select_from(Entry).where(Entry.user_id == user_id)) or 0
-        total_words = await db.scalar(select(func.sum(Entry.word_count)).where(Entry.user_id == user_id)) or 0
-        
-        # 2. Define Criteria (Hardcoded for prototype simplicity)
-        # (Achievement Code, Condition)
-        new_unlocks = []
-        
-        checks = [
-            ("FIRST_STEP", True), # Always unlock on first check if they have an entry (assumed called after entry)
-            ("STREAK_3", streak_data and streak_data.current_streak >= 3),
-            ("STREAK_7", streak_data and streak_data.current_streak >= 7),
-            ("STREAK_30", streak_data and streak_data.current_streak >= 30),
-            ("WORDS_1000", total_words >= 1000),
-            ("ENTRIES_10", entry_count >= 10),
-        ]
-
-        # 3. Check against DB
-        for code, condition in checks:
-            if condition:
-                await self._unlock_if_needed(user_id, code, db, new_unlocks)
-        
-        return new_unlocks
-
-    async def _unlock_if_needed(self, user_id: UUID, code: str, db: AsyncSession, new_unlocks: list):
-        # Find achievement definition
-        achievement = await db.scalar(select(Achievement).where(Achievement.criteria == code))
-        if not achievement:
-            return
-
-        # Check if already unlocked
-        existing = await db.scalar(
-            select(UserAchievement)
-            .where(UserAchievement.user_id == user_id, UserAchievement.achievement_id == achievement.id)
+        stats = await self._load_stats(user_id, db)
+        satisfied = evaluate_rules(stats)
+
+        # 2. Satisfied catalog entries the user doesn't have yet
+        result = await db.execute(
+            select(UserAchievement.achievement_id).where(UserAchievement.user_id == user_id)
+        )
+        unlocked = {row[0] for row in result.fetchall()}
+        to_unlock = {
+            achievement.id: achievement.name
+            for achievement in await achievement_catalog.all(db)
+            if achievement.criteria in satisfied and achievement.id not in unlocked
+        }
+        if not to_unlock:
+            return []
+
+        # 3. Unlock! Rows already unlocked by a concurrent request are skipped
+        result = await db.execute(
+            insert(UserAchievement)
+            .values([{"user_id": user_id, "achievement_id": achievement_id} for achievement_id in to_unlock])
+            .on_conflict_do_nothing(index_elements=["user_id", "achievement_id"])
+            .returning(UserAchievement.achievement_id)
         )
-        
-        if not existing:
-            # Unlock!
-            ua = UserAchievement(user_id=user_id, achievement_id=achievement.id)
-            db.add(ua)
+        inserted = [row[0] for row in result.fetchall()]
+        if commit:
             await db.commit()
-            new_unlocks.append(achievement.name)
+        return [to_unlock[achievement_id] for achievement_id in inserted]
+
+    async def _load_stats(self, user_id: UUID, db: AsyncSession) -> UserStats:
+        current_streak = (
+            select(StreakData.current_streak)
+            .where(StreakData.user_id == user_id)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(
+                func.coalesce(current_streak, 0),
+                func.count(Entry.id),
+                func.coalesce(func.sum(Entry.word_count), 0),
+            ).where(Entry.user_id == user_id)
+        )
+        return UserStats(*result.fetchone())
 
 gamification_service = GamificationService()
@@ -0,0 +1,207 @@
+import re
+from typing import Any, Dict, Tuple
+
+# Categorized generic phrases with severity weights
+GENERIC_PHRASES = {
+    'platitudes': [
+        'never give up', 'hard work pays off', 'believe in yourself',
+        'stay positive', 'think positive', 'positive vibes', 'good vibes',
+        'everything happens for a reason', 'live laugh love', 'follow your dreams',
+        'you miss 100% of the shots', 'rome wasn\'t built in a day',
+        'practice makes perfect', 'time heals all wounds'
+    ],
+    'vague_statements': [
+        'learned a lot', 'learned so much', 'was interesting', 'really cool',
+        'pretty good', 'went well', 'didn\'t go well', 'had fun',
+        'was productive', 'made progress', 'getting better', 'doing well'
+    ],
+    'surface_observations': [
+        'good day', 'bad day', 'tough day', 'long day', 'busy day',
+        'great experience', 'interesting experience', 'life lesson',
+        'success is', 'failure is', 'the key is', 'important to'
+    ]
+}
+
+# Concrete action verbs (past tense indicating actual actions)
+ACTION_VERBS = (
+    'implemented', 'debugged', 'refactored', 'analyzed', 'discovered',
+    'tested', 'wrote', 'built', 'created', 'designed', 'solved',
+    'practiced', 'completed', 'reviewed', 'studied', 'experimented',
+    'measured', 'calculated', 'researched', 'interviewed', 'presented',
+    'noticed', 'realized', 'figured out', 'identified', 'attempted'
+)
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MONTHS = (
+    'january', 'february', 'march', 'april', 'may', 'june', 'july',
+    'august', 'september', 'october', 'november', 'december'
+)
+
+# (phrase, category, weight) in catalog order, so phrase_matches keeps its order
+_PHRASES = tuple(
+    (phrase, category, 2 if category == 'platitudes' else 1)
+    for category, phrases in GENERIC_PHRASES.items()
+    for phrase in phrases
+)
+_NON_PROPER = frozenset(['i', 'the', 'a', 'an', 'it', 'this', 'that', 'these', 'those'])
+_INTENSIFIERS = frozenset(['very', 'really', 'extremely', 'super', 'so', 'quite'])
+_PUNCTUATION = ".,!?;:\"'"
+_ASCII_DIGITS = '0123456789'
+
+_NUMBER = re.compile(r'\d+')
+_QUOTE = re.compile(r'["\']([^"\']{3,})["\']')
+_LEARNED = re.compile(r'\blearned (that|about|how)\b')
+
+# Time expressions. Alternations with no literal prefix are slow to scan with
+# `re`, so each pattern is split into a cheap substring test plus a narrow
+# regex that only runs when the test passes; the result is identical to
+# searching the original patterns.
+_CLOCK_TIME = re.compile(r'\d{1,2}:\d{2}')  # 3:45
+_AM_PM = re.compile(r'[ap]m')  # 3pm / 3 pm, digit checked by _has_am_pm
+_DURATION = re.compile(r'for \d+ (minute|hour|day|week)s?')
+_LAST_PERIOD = re.compile(r'last\s\w')  # last week, last night
+_WEEKDAY_WORDS = {day: re.compile(rf'\b{day}\b') for day in WEEKDAYS}
+_MONTH_WORDS = {month: re.compile(rf'\b{month}\b') for month in MONTHS}
+_PARTS_OF_DAY = ('morning', 'afternoon', 'evening', 'night')
+_RELATIVE_DAYS = ('yesterday', 'today', 'tonight')
+
+
+def _has_am_pm(text: str) -> bool:
+    """Equivalent to searching r'\\d{1,2}\\s?(am|pm)', scanning for the literal part first."""
+    for match in _AM_PM.finditer(text):
+        i = match.start()
+        if i > 0 and (text[i - 1].isdecimal() or (i > 1 and text[i - 1].isspace() and text[i - 2].isdecimal())):
+            return True
+    return False
+
+
+def _any_word(text: str, patterns: Dict[str, re.Pattern]) -> bool:
+    return any(word in text and pattern.search(text) for word, pattern in patterns.items())
+
+
+def _count_time_references(content_lower: str, has_numbers: bool) -> int:
+    return sum((
+        has_numbers and ':' in content_lower and bool(_CLOCK_TIME.search(content_lower)),
+        has_numbers and 'm' in content_lower and _has_am_pm(content_lower),
+        'day' in content_lower and _any_word(content_lower, _WEEKDAY_WORDS),
+        _any_word(content_lower, _MONTH_WORDS),
+        any(part in content_lower for part in _PARTS_OF_DAY),
+        has_numbers and 'for ' in content_lower and bool(_DURATION.search(content_lower)),
+        any(day in content_lower for day in _RELATIVE_DAYS)
+            or ('last' in content_lower and bool(_LAST_PERIOD.search(content_lower))),
+    ))
+
+
+def analyze_generic(content: str) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Detect generic/cliché content using multi-dimensional heuristic analysis.
+
+    Returns:
+        Tuple of (is_generic: bool, analysis_details: dict)
+    """
+    content_lower = content.lower()
+    words = content.split()
+    word_count = len(words)
+
+    # Initialize scoring
+    specificity_score = 0
+    generic_score = 0
+
+    # 1. GENERIC PHRASE DETECTION (weighted by severity)
+    phrase_matches = []
+    for phrase, category, weight in _PHRASES:
+        if phrase in content_lower:
+            generic_score += weight
+            phrase_matches.append((phrase, category))
+
+    # 2. SPECIFICITY INDICATORS
+
+    # Named entities (improved proper noun detection); a word can only
+    # qualify if it starts with a capital or with punctuation to strip
+    proper_nouns = 0
+    for word in words[1:]:
+        first = word[0]
+        if first.isupper() or first in _PUNCTUATION:
+            cleaned = word.strip(_PUNCTUATION)
+            if len(cleaned) > 1 and cleaned[0].isupper() and cleaned.lower() not in _NON_PROPER:
+                proper_nouns += 1
+    specificity_score += proper_nouns
+
+    # Numbers and quantitative data (ASCII text without digits skips the regex)
+    if content.isascii() and not any(digit in content for digit in _ASCII_DIGITS):
+        numbers = 0
+    else:
+        numbers = len(_NUMBER.findall(content))
+    specificity_score += numbers
+
+    # Time expressions (temporal specificity)
+    time_matches = _count_time_references(content_lower, numbers > 0)
+    specificity_score += time_matches * 2
+
+    action_count = sum(1 for verb in ACTION_VERBS if verb in content_lower)
+    specificity_score += action_count * 2
+
+    # Quoted text or specific dialogue
+    if '"' in content or "'" in content:
+        specificity_score += len(_QUOTE.findall(content)) * 2
+
+    # 3. RED FLAGS
+
+    # Vague learning statements
+    if 'learned ' in content_lower and _LEARNED.search(content_lower):
+        # Check if there's substantial follow-up
+        learned_pos = content_lower.find('learned')
+        remaining = content_lower[learned_pos:]
+        if len(remaining.split()) < 15:  # Not much substance after "learned"
+            generic_score += 1
+
+    # Excessive intensifiers without substance
+    intensifier_count = sum(map(_INTENSIFIERS.__contains__, content_lower.split()))
+    if intensifier_count >= 3 and word_count < 50:
+        generic_score += 1
+
+    # Calculate specificity ratio
+    specificity_ratio = specificity_score / word_count if word_count > 0 else 0
+
+    # 4. ANALYSIS SUMMARY
+    analysis = {
+        'word_count': word_count,
+        'generic_score': generic_score,
+        'specificity_score': specificity_score,
+        'specificity_ratio': specificity_ratio,
+        'proper_nouns': proper_nouns,
+        'numbers': numbers,
+        'time_references': time_matches,
+        'action_verbs': action_count,
+        'phrase_matches': phrase_matches
+    }
+
+    # 5. DECISION LOGIC (graduated thresholds by length)
+    is_generic = False
+
+    # Critical: Multiple generic phrases with minimal specifics
+    if generic_score >= 3 and specificity_score < 2:
+        is_generic = True
+
+    # High generic language with low specificity ratio
+    elif generic_score >= 2 and specificity_ratio < 0.12:
+        is_generic = True
+
+    # Short entries (< 30 words)
+    elif word_count < 30:
+        if generic_score >= 1 and specificity_score == 0:
+            is_generic = True
+        elif generic_score > 0 and specificity_ratio < 0.1:
+            is_generic = True
+
+    # Medium entries (30-100 words)
+    elif 30 <= word_count < 100:
+        if generic_score >= 2 and specificity_score < 3:
+            is_generic = True
+
+    # Longer entries (100+ words)
+    elif word_count >= 100:
+        if generic_score >= 3 and specificity_ratio < 0.08:
+            is_generic = True
+
+    return is_generic, analysis
@@ -1,11 +1,147 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func, tuple_
 from datetime import date, timedelta
+from typing import Awaitable, Callable, List, NamedTuple, Optional, Tuple
 from ..models.entry import Entry
 from ..models.streak import StreakData
 from uuid import UUID
 
-async def calculate_streak(user_id: UUID, db: AsyncSession):
+# Days fetched per query when a backdated entry joins runs together
+BACKFILL_CHUNK_DAYS = 60
+
+# (start, end) -> distinct entry dates in [start, end), newest first
+DateFetcher = Callable[[date, date], Awaitable[List[date]]]
+
+
+class StreakSummary(NamedTuple):
+    current_streak: int
+    last_entry_date: Optional[date]
+    current_run_start: Optional[date]
+    total_entries: int
+
+
+def effective_current_streak(
+    last_entry_date: Optional[date],
+    current_run_start: Optional[date],
+    today: Optional[date] = None,
+) -> int:
+    """Length of the run ending at last_entry_date, or 0 if it ended before yesterday."""
+    if last_entry_date is None or current_run_start is None:
+        return 0
+    today = today or date.today()
+    if last_entry_date < today - timedelta(days=1):
+        return 0
+    return (last_entry_date - current_run_start).days + 1
+
+
+def summarize_dates(dates: List[date], today: Optional[date] = None) -> StreakSummary:
+    """Full recompute from every distinct entry date (newest first)."""
+    if not dates:
+        return StreakSummary(0, None, None, 0)
+
+    run_start = dates[0]
+    for newer, older in zip(dates, dates[1:]):
+        if newer - older != timedelta(days=1):
+            break
+        run_start = older
+
+    return StreakSummary(
+        current_streak=effective_current_streak(dates[0], run_start, today),
+        last_entry_date=dates[0],
+        current_run_start=run_start,
+        total_entries=len(dates),
+    )
+
+
+async def extend_run_backwards(run_start: date, fetch_dates: DateFetcher) -> date:
+    """
+    Walk back from run_start through consecutive entry dates.
+
+    Only the days adjacent to the run are read, BACKFILL_CHUNK_DAYS at a time,
+    so the cost is bounded by the length of the merged run rather than the
+    user's whole history.
+    """
+    while True:
+        window_start = run_start - timedelta(days=BACKFILL_CHUNK_DAYS)
+        for day in await fetch_dates(window_start, run_start):
+            if day != run_start - timedelta(days=1):
+                return run_start
+            run_start = day
+        if run_start != window_start:
+            return run_start
+
+
+async def apply_entry_date(
+    summary: StreakSummary,
+    entry_date: date,
+    is_new_day: bool,
+    fetch_dates: DateFetcher,
+    today: Optional[date] = None,
+) -> StreakSummary:
+    """
+    Fold one newly inserted entry into a streak summary.
+
+    A later date extends or restarts the trailing run. A backdated date only
+    matters when it lands right before the trailing run, in which case the
+    run is extended backwards through any older consecutive days.
+    """
+    last, run_start, total = summary.last_entry_date, summary.current_run_start, summary.total_entries
+
+    if is_new_day:
+        total += 1
+        if last is None:
+            last = run_start = entry_date
+        elif entry_date > last:
+            if entry_date != last + timedelta(days=1):
+                run_start = entry_date
+            last = entry_date
+        elif entry_date == run_start - timedelta(days=1):
+            run_start = await extend_run_backwards(entry_date, fetch_dates)
+
+    return StreakSummary(
+        current_streak=effective_current_streak(last, run_start, today),
+        last_entry_date=last,
+        current_run_start=run_start,
+        total_entries=total,
+    )
+
+
+def _date_fetcher(user_id: UUID, db: AsyncSession) -> DateFetcher:
+    async def fetch(start: date, end: date) -> List[date]:
+        result = await db.execute(
+            select(Entry.date)
+            .where(Entry.user_id == user_id, Entry.date >= start, Entry.date < end)
+            .distinct()
+            .order_by(desc(Entry.date))
+        )
+        return [row[0] for row in result.fetchall()]
+    return fetch
+
+
+def _store_summary(streak_data: StreakData, summary: StreakSummary):
+    streak_data.current_streak = summary.current_streak
+    streak_data.last_entry_date = summary.last_entry_date
+    streak_data.current_run_start = summary.current_run_start
+    streak_data.total_entries = summary.total_entries # distinct entry days
+    # Use 0 as default if longest_streak is None
+    streak_data.longest_streak = max(streak_data.longest_streak or 0, summary.current_streak)
+
+
+async def _load_for_update(user_id: UUID, db: AsyncSession) -> StreakData:
+    streak_data = await db.scalar(
+        select(StreakData).where(StreakData.user_id == user_id).with_for_update()
+    )
+    if not streak_data:
+        streak_data = StreakData(
+            user_id=user_id,
+            longest_streak=0  # Initialize to 0 to avoid None comparison
+        )
+        db.add(streak_data)
+    return streak_data
+
+
+async def _recompute(streak_data: StreakData, user_id: UUID, db: AsyncSession) -> StreakSummary:
+    """Store a full recompute from every entry date on an already loaded row."""
     # Get all unique entry dates for user, ordered descending
     result = await db.execute(
         select(Entry.date)
@@ -13,40 +149,121 @@ async def calculate_streak(user_id: UUID, db: AsyncSession):
         .distinct()
         .order_by(desc(Entry.date))
     )
-    dates = [row[0] for row in result.fetchall()]
-    
-    if not dates:
+    summary = summarize_dates([row[0] for row in result.fetchall()])
+    _store_summary(streak_data, summary)
+    return summary
+
+
+async def calculate_streak(user_id: UUID, db: AsyncSession, commit: bool = True):
+    """
+    Recompute the streak from every entry date and store it.
+
+    Linear in the user's history; the request path uses record_entry, this is
+    for bulk imports, rows that predate incremental tracking and reconciliation.
+
+    The row is locked before the dates are read, so a concurrent record_entry
+    (another worker) either commits first and is included, or waits and
+    applies its entry on top; it's never overwritten by a stale recompute.
+    With commit=False the caller commits, and the lock is held until then.
+    """
+    streak_data = await db.scalar(
+        select(StreakData).where(StreakData.user_id == user_id).with_for_update()
+    )
+    result = await db.execute(
+        select(Entry.date)
+        .where(Entry.user_id == user_id)
+        .distinct()
+        .order_by(desc(Entry.date))
+    )
+    summary = summarize_dates([row[0] for row in result.fetchall()])
+    if summary.last_entry_date is None:
+        if commit:
+            await db.commit() # Release the lock
         return 0, 0
 
-    current_streak = 0
-    today = date.today()
-    
-    # Check if last entry was today or yesterday
-    if dates[0] == today or dates[0] == today - timedelta(days=1):
-        current_streak = 1
-        for i in range(len(dates) - 1):
-            if dates[i] - dates[i+1] == timedelta(days=1):
-                current_streak += 1
-            else:
-                break
-    
-    # Update StreakData table
+    if streak_data is None:
+        streak_data = StreakData(user_id=user_id, longest_streak=0)
+        db.add(streak_data)
+    _store_summary(streak_data, summary)
+    if commit:
+        await db.commit()
+    return summary.current_streak, streak_data.longest_streak
+
+
+async def record_entry(
+    user_id: UUID,
+    entry_date: date,
+    db: AsyncSession,
+    entry_id: Optional[UUID] = None,
+    commit: bool = True,
+):
+    """
+    Update StreakData for an entry that has just been committed.
+
+    Reads the user's streak row plus a lookup of entries on entry_date, so the
+    cost doesn't grow with the length of the history. Users without a run
+    start yet (new, or tracked before incremental updates) fall back to
+    calculate_streak once.
+
+    With entry_id, the day counts as new only if no entry on it was created
+    before this one, which stays correct when several queued entries for the
+    same day are committed before any of them is recorded.
+
+    With commit=False the update is left in the caller's transaction, so it
+    can't be applied twice when a later step in that transaction fails.
+    """
+    streak_data = await _load_for_update(user_id, db)
+    if streak_data.current_run_start is None:
+        # Recompute on the row we already hold; the session belongs to the
+        # caller, so rolling it back would expire their objects
+        summary = await _recompute(streak_data, user_id, db)
+        if commit:
+            await db.commit()
+        return summary.current_streak, streak_data.longest_streak
+
+    if entry_id is not None:
+        created_at = select(Entry.created_at).where(Entry.id == entry_id).scalar_subquery()
+        earlier = await db.scalar(
+            select(Entry.id)
+            .where(
+                Entry.user_id == user_id,
+                Entry.date == entry_date,
+                tuple_(Entry.created_at, Entry.id) < tuple_(created_at, entry_id),
+            )
+            .limit(1)
+        )
+        is_new_day = earlier is None
+    else:
+        same_day = await db.scalar(
+            select(func.count())
+            .select_from(
+                select(Entry.id)
+                .where(Entry.user_id == user_id, Entry.date == entry_date)
+                .limit(2)
+                .subquery()
+            )
+        )
+        is_new_day = same_day == 1
+    summary = StreakSummary(
+        streak_data.current_streak or 0,
+        streak_data.last_entry_date,
+        streak_data.current_run_start,
+        streak_data.total_entries or 0,
+    )
+    summary = await apply_entry_date(
+        summary, entry_date, is_new_day, _date_fetcher(user_id, db)
+    )
+
+    _store_summary(streak_data, summary)
+    if commit:
+        await db.commit()
+    return summary.current_streak, streak_data.longest_streak
+
+
+async def get_streak(user_id: UUID, db: AsyncSession) -> Tuple[int, int]:
+    """Current and longest streak from the user's StreakData row alone."""
     streak_data = await db.scalar(select(StreakData).where(StreakData.user_id == user_id))
     if not streak_data:
-        streak_data = StreakData(
-            user_id=user_id,
-            longest_streak=0  # Initialize to 0 to avoid None comparison
-        )
-        db.add(streak_data)
-    
-    streak_data.current_streak = current_streak
-    streak_data.last_entry_date = dates[0]
-    streak_data.total_entries = len(dates) # or count all entries if multiple per day allowed
-    
-    # Use 0 as default if longest_streak is None
-    longest_streak = streak_data.longest_streak or 0
-    if current_streak > longest_streak:
-        streak_data.longest_streak = current_streak
-        
-    await db.commit()
-    return current_streak, streak_data.longest_streak
+        return 0, 0
+    current = effective_current_streak(streak_data.last_entry_date, streak_data.current_run_start)
+    return current, max(streak_data.longest_streak or 0, current)
@@ -0,0 +1,241 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..models.outbox import OutboxTask
+
+Handler = Callable[[Dict[str, Any], AsyncSession], Awaitable[None]]
+
+# Cap on the exponential retry delay
+_MAX_BACKOFF_SECONDS = 300
+_MAX_ERROR_CHARS = 1000
+# Rows deleted per statement when pruning, to keep each transaction short
+_PRUNE_BATCH = 5000
+
+
+class TaskQueue:
+    """
+    In-process worker for side effects that don't need to delay the response.
+
+    Producers enqueue() an OutboxTask in the same transaction as their own
+    writes, then dispatch() it after committing. A single asyncio worker per
+    process claims due tasks with FOR UPDATE SKIP LOCKED, so several workers
+    can share the table and anything left over from a restart is picked up
+    on the next poll.
+
+    Handlers run on the claiming session inside a savepoint and must not
+    commit: their writes are committed together with the task's
+    processed_at, so a failed (or crashed) attempt leaves nothing behind
+    and the retry applies the task exactly once.
+
+    In inline mode dispatch() runs the handler immediately on the caller's
+    session instead, which keeps tests and single-shot scripts deterministic.
+
+    Processed rows are kept for retention_seconds (for debugging and lag
+    stats) and then deleted, at most every prune_interval seconds.
+    """
+
+    def __init__(
+        self,
+        inline: bool,
+        poll_interval: float,
+        max_attempts: int,
+        session_factory=AsyncSessionLocal,
+        retention_seconds: float = 72 * 3600,
+        prune_interval: float = 3600,
+    ):
+        self.inline = inline
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retention_seconds = retention_seconds
+        self.prune_interval = prune_interval
+        self._last_prune = time.monotonic()
+        self._session_factory = session_factory
+        self._handlers: Dict[str, Handler] = {}
+        self._wake = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.pruned = 0
+
+    def handler(self, kind: str):
+        """Register the coroutine that processes tasks of this kind."""
+        def register(func: Handler) -> Handler:
+            self._handlers[kind] = func
+            return func
+        return register
+
+    def enqueue(self, db: AsyncSession, kind: str, payload: Dict[str, Any]) -> OutboxTask:
+        """Add a task to the caller's session; it's durable once they commit."""
+        task = OutboxTask(kind=kind, payload=payload, attempts=0)
+        db.add(task)
+        return task
+
+    async def dispatch(self, task: OutboxTask, db: AsyncSession):
+        """Hand a committed task to the worker (or run it now in inline mode)."""
+        if not self.inline:
+            self._wake.set()
+            return
+
+        await self._handlers[task.kind](task.payload, db)
+        task.processed_at = datetime.now(timezone.utc)
+        await db.commit()
+        self.processed += 1
+        await self._maybe_prune()
+
+    def start(self):
+        if self.inline or self._worker is not None:
+            return
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def run_pending(self) -> int:
+        """Process due tasks until none are left; returns how many were claimed."""
+        claimed = 0
+        while await self._process_one():
+            claimed += 1
+        return claimed
+
+    async def prune(self) -> int:
+        """Delete tasks processed more than retention_seconds ago; returns how many."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        deleted = 0
+        while True:
+            async with self._session_factory() as db:
+                expired = (
+                    select(OutboxTask.id)
+                    .where(OutboxTask.processed_at < cutoff)
+                    .limit(_PRUNE_BATCH)
+                )
+                result = await db.execute(delete(OutboxTask).where(OutboxTask.id.in_(expired)))
+                await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < _PRUNE_BATCH:
+                break
+        self.pruned += deleted
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "inline" if self.inline else "background",
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "pruned": self.pruned,
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+        }
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                await self.run_pending()
+                await self._maybe_prune()
+            except Exception as e:
+                print(f"Task queue worker error: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _maybe_prune(self):
+        if time.monotonic() - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = time.monotonic()
+        try:
+            await self.prune()
+        except Exception as e:
+            print(f"Task queue prune error: {e}")
+
+    async def _process_one(self) -> bool:
+        async with self._session_factory() as db:
+            # The row stays locked until this session commits
+            task = await db.scalar(
+                select(OutboxTask)
+                .where(OutboxTask.processed_at.is_(None), OutboxTask.available_at <= datetime.now(timezone.utc))
+                .order_by(OutboxTask.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if task is None:
+                return False
+
+            now = datetime.now(timezone.utc)
+            self.last_lag_seconds = (now - task.created_at).total_seconds()
+            self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+
+            try:
+                async with db.begin_nested():
+                    await self._handlers[task.kind](task.payload, db)
+            except Exception as e:
+                task.attempts += 1
+                task.last_error = f"{type(e).__name__}: {e}"[:_MAX_ERROR_CHARS]
+                if task.attempts >= self.max_attempts:
+                    print(f"Task {task.id} ({task.kind}) failed permanently: {task.last_error}")
+                    task.processed_at = now
+                    self.failed += 1
+                else:
+                    delay = min(2 ** task.attempts, _MAX_BACKOFF_SECONDS)
+                    task.available_at = now + timedelta(seconds=delay)
+                    self.retried += 1
+            else:
+                task.processed_at = now
+                self.processed += 1
+
+            await db.commit()
+            return True
+
+
+# Singleton instance
+task_queue = TaskQueue(
+    inline=settings.TASK_QUEUE_INLINE,
+    poll_interval=settings.TASK_QUEUE_POLL_INTERVAL,
+    max_attempts=settings.TASK_QUEUE_MAX_ATTEMPTS,
+    retention_seconds=settings.TASK_OUTBOX_RETENTION_HOURS * 3600,
+    prune_interval=settings.TASK_OUTBOX_PRUNE_INTERVAL,
+)
+
+
+@task_queue.handler("entry_created")
+async def process_entry_created(payload: Dict[str, Any], db: AsyncSession):
+    """Streak and achievement updates for a newly committed entry."""
+    from .streak_calculator import record_entry
+    from .gamification import gamification_service
+
+    user_id = UUID(payload["user_id"])
+    await record_entry(
+        user_id, date.fromisoformat(payload["date"]), db, entry_id=UUID(payload["entry_id"]), commit=False
+    )
+    await gamification_service.check_achievements(user_id, db, commit=False)
+
+
+@task_queue.handler("entries_imported")
+async def process_entries_imported(payload: Dict[str, Any], db: AsyncSession):
+    """One streak and achievement update for a whole bulk import."""
+    from .streak_calculator import calculate_streak
+    from .gamification import gamification_service
+
+    user_id = UUID(payload["user_id"])
+    # Imports backfill arbitrary past dates, so recompute instead of extending
+    await calculate_streak(user_id, db, commit=False)
+    await gamification_service.check_achievements(user_id, db, commit=False)
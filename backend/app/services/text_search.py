@@ -0,0 +1,51 @@
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import func, literal, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.entry import Entry
+
+# Must match the expression of the generated entries.search_vector column
+SEARCH_CONFIG = "english"
+# Rendered inline: a bound (varchar) parameter doesn't resolve to regconfig
+_CONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def search_query(terms: str):
+    """Parse user input (quotes, OR, -word) into a tsquery."""
+    return func.websearch_to_tsquery(_CONFIG, terms)
+
+
+def matches(terms: str):
+    """WHERE clause served by the GIN index on entries.search_vector."""
+    return Entry.search_vector.op("@@")(search_query(terms))
+
+
+async def search_entries(db: AsyncSession, user_id: UUID, terms: str, limit: int) -> List:
+    """
+    The user's entries matching `terms`, best first.
+
+    Only the top `limit` rows get a ts_headline, which re-parses the content
+    and is the expensive part. Rows have id, date, word_count, rank and
+    headline (matches wrapped in <mark>).
+    """
+    query = search_query(terms)
+    ranked = (
+        select(
+            Entry.id, Entry.date, Entry.word_count, Entry.content,
+            func.ts_rank_cd(Entry.search_vector, query).label("rank"),
+        )
+        .where(Entry.user_id == user_id, Entry.search_vector.op("@@")(query))
+        .order_by(func.ts_rank_cd(Entry.search_vector, query).desc(), Entry.date.desc())
+        .limit(limit)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            ranked.c.id, ranked.c.date, ranked.c.word_count, ranked.c.rank,
+            func.ts_headline(_CONFIG, ranked.c.content, query, literal(HEADLINE_OPTIONS)).label("headline"),
+        ).order_by(ranked.c.rank.desc(), ranked.c.date.desc())
+    )
+    return result.fetchall()
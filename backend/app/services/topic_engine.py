@@ -0,0 +1,246 @@
+import asyncio
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.entry import Entry
+from .vector_search import normalize_rows
+
+_TOKEN = re.compile(r"[a-z][a-z'-]{2,}")
+
+# Common English words plus journaling filler that says nothing about a topic
+STOP_WORDS = frozenset("""
+    about above after again against all also and any are aren't because been before being
+    below between both but can can't could couldn't did didn't does doesn't doing don't down
+    during each few for from further get got had hadn't has hasn't have haven't having her
+    here hers herself him himself his how i'm i've into isn't it's its itself just let's
+    lot lots made make many more most much must my myself nor not now off once only other
+    our ours ourselves out over own really same she should shouldn't so some such than
+    that that's the their theirs them themselves then there there's these they they're
+    this those through too under until very was wasn't way we're we've well were weren't
+    what what's when where which while who whom why will with won't would wouldn't you
+    you're your yours yourself
+    today yesterday tomorrow day days week morning evening night time things thing
+    learned learn learning feel felt think thought went going good great new like
+    one two first still even able need needed want wanted used using use
+""".split())
+
+
+def extract_keywords(content: str) -> Counter:
+    """Candidate topic words in an entry, with how often each occurs."""
+    return Counter(token for token in _TOKEN.findall(content.lower()) if token not in STOP_WORDS)
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    k: int,
+    max_iter: int = 25,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cosine k-means on L2-normalized rows, fully vectorized.
+
+    Seeded with k-means++ on cosine distance. Returns (centroids, labels);
+    a cluster that loses all its members keeps its previous centroid.
+    """
+    n = len(vectors)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+
+    first = int(rng.integers(n))
+    centroids = [vectors[first]]
+    distance = 1 - vectors @ vectors[first]
+    for _ in range(1, k):
+        weights = np.clip(distance, 0, None)
+        total = weights.sum()
+        index = int(rng.choice(n, p=weights / total)) if total > 0 else int(rng.integers(n))
+        centroids.append(vectors[index])
+        distance = np.minimum(distance, 1 - vectors @ vectors[index])
+    centroids = np.stack(centroids)
+
+    for _ in range(max_iter):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        members = np.eye(k, dtype=np.float32)[labels]
+        sums = members.T @ vectors
+        empty = members.sum(axis=0) == 0
+        sums[empty] = centroids[empty]
+        updated = normalize_rows(sums)
+        if np.allclose(updated, centroids, atol=1e-6):
+            break
+        centroids = updated
+
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+
+@dataclass
+class _UserTopics:
+    centroids: np.ndarray # (k, dim), rows L2-normalized
+    counts: np.ndarray # entries per cluster
+    cluster_terms: List[Counter] # per cluster: term -> occurrences in member entries
+    doc_freq: Counter # term -> entries containing it
+    fitted_entries: int
+    added_since_fit: int = 0
+    topics: Optional[List[str]] = None
+
+
+class TopicEngine:
+    """
+    Per-user topics from clustering entry embeddings.
+
+    A user's most recent entries are clustered once (spherical k-means) and
+    each cluster is labelled with the keyword most specific to its members.
+    New entries update the nearest centroid in place (mini-batch k-means
+    step) and its keyword counts, so requests only re-rank labels; a full
+    refit happens once the new entries outnumber refit_ratio of the fit.
+
+    Like UserEmbeddingCache, each worker process holds its own state, so
+    entries added through another worker only count after the next refit.
+    """
+
+    def __init__(
+        self,
+        max_clusters: int,
+        max_entries: int,
+        max_users: int,
+        top_n: int = 3,
+        refit_ratio: float = 0.5,
+    ):
+        self.max_clusters = max(1, max_clusters)
+        self.max_entries = max_entries
+        self.max_users = max_users
+        self.top_n = top_n
+        self.refit_ratio = refit_ratio
+        self.hits = 0
+        self.misses = 0
+        self._users: "OrderedDict[UUID, _UserTopics]" = OrderedDict()
+
+    async def top_topics(self, db: AsyncSession, user_id: UUID) -> List[str]:
+        """Labels of the user's largest clusters, biggest first."""
+        state = self._users.get(user_id)
+        if state is not None and state.added_since_fit <= self.refit_ratio * state.fitted_entries:
+            self.hits += 1
+            self._users.move_to_end(user_id)
+        else:
+            self.misses += 1
+            state = await self.fit(db, user_id)
+
+        if state.topics is None:
+            state.topics = self._label(state)
+        return state.topics
+
+    async def fit(self, db: AsyncSession, user_id: UUID) -> _UserTopics:
+        result = await db.execute(
+            select(Entry.content, Entry.embedding)
+            .where(Entry.user_id == user_id, Entry.embedding_model_version == settings.EMBEDDING_MODEL_VERSION)
+            .order_by(Entry.date.desc())
+            .limit(self.max_entries)
+        )
+        rows = result.fetchall()
+        # NumPy releases the GIL, so clustering doesn't stall the event loop
+        state = await asyncio.to_thread(
+            self._fit_state,
+            [row.content for row in rows],
+            [row.embedding for row in rows],
+        )
+        self._users.pop(user_id, None)
+        self._users[user_id] = state
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return state
+
+    def add(self, user_id: UUID, embedding: np.ndarray, content: str):
+        """Fold a newly inserted entry into the user's topics, if they're cached."""
+        state = self._users.get(user_id)
+        if state is None:
+            return
+        vector = normalize_rows(embedding).reshape(-1)
+        keywords = extract_keywords(content)
+
+        if len(state.centroids) == 0:
+            state.centroids = vector.reshape(1, -1)
+            state.counts = np.ones(1)
+            state.cluster_terms = [keywords]
+        else:
+            # Mini-batch k-means step with a per-centre learning rate of 1/count
+            j = int(np.argmax(state.centroids @ vector))
+            state.counts[j] += 1
+            centroid = state.centroids[j] + (vector - state.centroids[j]) / state.counts[j]
+            state.centroids[j] = centroid / (np.linalg.norm(centroid) or 1)
+            state.cluster_terms[j].update(keywords)
+
+        state.doc_freq.update(keywords.keys())
+        state.added_since_fit += 1
+        state.topics = None
+
+    def invalidate(self, user_id: UUID):
+        self._users.pop(user_id, None)
+
+    def clear(self):
+        self._users.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"users": len(self._users), "hits": self.hits, "misses": self.misses}
+
+    def _fit_state(self, contents: Sequence[str], embeddings: Sequence) -> _UserTopics:
+        if not contents:
+            return _UserTopics(
+                centroids=np.empty((0, 0), dtype=np.float32), counts=np.zeros(0),
+                cluster_terms=[], doc_freq=Counter(), fitted_entries=0,
+            )
+
+        vectors = normalize_rows(np.stack([np.asarray(e) for e in embeddings]))
+        k = min(self.max_clusters, max(1, round(math.sqrt(len(contents) / 2))))
+        centroids, labels = spherical_kmeans(vectors, k)
+
+        cluster_terms = [Counter() for _ in range(len(centroids))]
+        doc_freq = Counter()
+        for content, label in zip(contents, labels):
+            keywords = extract_keywords(content)
+            cluster_terms[label].update(keywords)
+            doc_freq.update(keywords.keys())
+
+        return _UserTopics(
+            centroids=centroids,
+            counts=np.bincount(labels, minlength=len(centroids)).astype(np.float64),
+            cluster_terms=cluster_terms,
+            doc_freq=doc_freq,
+            fitted_entries=len(contents),
+        )
+
+    def _label(self, state: _UserTopics) -> List[str]:
+        """Pick each cluster's most distinctive keyword (occurrences per member x idf)."""
+        total = max(1, int(state.counts.sum()))
+        topics = []
+        for j in np.argsort(-state.counts, kind="stable"):
+            size = state.counts[j]
+            if size == 0:
+                continue
+            candidates = [
+                (-(count / size) * (math.log((1 + total) / (1 + state.doc_freq[term])) + 1), term)
+                for term, count in state.cluster_terms[j].items()
+                if term.title() not in topics
+            ]
+            if not candidates:
+                continue
+            topics.append(min(candidates)[1].title())
+            if len(topics) == self.top_n:
+                break
+        return topics
+
+
+# Singleton instance
+topic_engine = TopicEngine(
+    max_clusters=settings.TOPIC_MAX_CLUSTERS,
+    max_entries=settings.TOPIC_MAX_ENTRIES,
+    max_users=settings.TOPIC_CACHE_MAX_USERS,
+)
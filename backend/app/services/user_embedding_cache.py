@@ -0,0 +1,202 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.entry import Entry
+from .vector_search import normalize_rows
+
+# Rough per-row cost of the id/date/snippet metadata, for the byte budget
+_ROW_OVERHEAD_BYTES = 200
+# Enough of the content for similarity feedback and result snippets
+_SNIPPET_CHARS = 200
+# Users remembered as too large to cache, so they skip the load query
+_MAX_OVERSIZED_USERS = 10_000
+
+
+class CachedMatch(NamedTuple):
+    """Same shape as the rows returned by vector_search.nearest_entries."""
+    id: UUID
+    date: date
+    content: str
+    word_count: int
+    distance: float
+
+
+@dataclass
+class _UserMatrix:
+    ids: List[UUID]
+    dates: List[date]
+    snippets: List[str]
+    word_counts: List[int]
+    matrix: np.ndarray  # (n, dim) float32, rows L2-normalized
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + len(self.ids) * _ROW_OVERHEAD_BYTES
+
+
+class UserEmbeddingCache:
+    """
+    In-process cache of each user's entry embeddings as one NumPy matrix.
+
+    Users are loaded lazily from `entries` on their first lookup and kept up
+    to date by add() after inserts. Eviction is LRU by total bytes. Users with
+    more than max_rows_per_user entries are never cached, so callers fall back
+    to the pgvector query for them.
+
+    Single-worker only: each process holds its own cache and nothing tells
+    it about entries inserted or deleted through another worker, so novelty
+    checks there would run against stale matrices until eviction or a
+    restart. Leave USER_EMBEDDING_CACHE_ENABLED off when running more than
+    one worker process.
+    """
+
+    def __init__(self, max_bytes: int, max_rows_per_user: int):
+        self.max_bytes = max_bytes
+        self.max_rows_per_user = max_rows_per_user
+        self.hits = 0
+        self.misses = 0
+        self._users: "OrderedDict[UUID, _UserMatrix]" = OrderedDict()
+        self._oversized: "OrderedDict[UUID, None]" = OrderedDict()
+        self._bytes = 0
+
+    async def nearest(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        embedding: np.ndarray,
+        k: int = 1,
+    ) -> Optional[List[CachedMatch]]:
+        """
+        Vectorized cosine top-k over the user's cached entries.
+
+        Returns None when the user can't be cached, so the caller should
+        run the database query instead.
+        """
+        user = self._users.get(user_id)
+        if user is not None:
+            self.hits += 1
+            self._users.move_to_end(user_id)
+        else:
+            self.misses += 1
+            user = await self.load(db, user_id)
+            if user is None:
+                return None
+
+        if not user.ids:
+            return []
+
+        similarities = user.matrix @ normalize_rows(embedding)
+        k = min(k, len(user.ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [
+            CachedMatch(
+                user.ids[i], user.dates[i], user.snippets[i], user.word_counts[i],
+                float(1 - similarities[i]),
+            )
+            for i in top
+        ]
+
+    async def load(self, db: AsyncSession, user_id: UUID) -> Optional[_UserMatrix]:
+        if user_id in self._oversized:
+            self._oversized.move_to_end(user_id)
+            return None
+
+        result = await db.execute(
+            select(Entry.id, Entry.date, Entry.content, Entry.word_count, Entry.embedding)
+            .where(Entry.user_id == user_id, Entry.embedding_model_version == settings.EMBEDDING_MODEL_VERSION)
+            .limit(self.max_rows_per_user + 1)
+        )
+        rows = result.fetchall()
+        if len(rows) > self.max_rows_per_user:
+            self._mark_oversized(user_id)
+            return None
+
+        user = _UserMatrix(
+            ids=[row.id for row in rows],
+            dates=[row.date for row in rows],
+            snippets=[row.content[:_SNIPPET_CHARS] for row in rows],
+            word_counts=[row.word_count for row in rows],
+            matrix=(
+                normalize_rows(np.stack([np.asarray(row.embedding) for row in rows]))
+                if rows else np.empty((0, 0), dtype=np.float32)
+            ),
+        )
+        self._store(user_id, user)
+        return user
+
+    def add(self, user_id: UUID, entry: Entry):
+        """Append a newly inserted entry if its owner is currently cached."""
+        user = self._users.get(user_id)
+        if user is None:
+            return
+        if len(user.ids) >= self.max_rows_per_user:
+            self.invalidate(user_id)
+            self._mark_oversized(user_id)
+            return
+
+        row = normalize_rows(entry.embedding).reshape(1, -1)
+        self._bytes -= user.nbytes
+        user.ids.append(entry.id)
+        user.dates.append(entry.date)
+        user.snippets.append(entry.content[:_SNIPPET_CHARS])
+        user.word_counts.append(entry.word_count)
+        user.matrix = row if user.matrix.size == 0 else np.vstack([user.matrix, row])
+        self._bytes += user.nbytes
+        self._evict()
+
+    def invalidate(self, user_id: UUID):
+        user = self._users.pop(user_id, None)
+        if user is not None:
+            self._bytes -= user.nbytes
+        self._oversized.pop(user_id, None)
+
+    def clear(self):
+        self._users.clear()
+        self._oversized.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._users),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _store(self, user_id: UUID, user: _UserMatrix):
+        self.invalidate(user_id)
+        self._users[user_id] = user
+        self._bytes += user.nbytes
+        self._evict()
+
+    def _mark_oversized(self, user_id: UUID):
+        self._oversized[user_id] = None
+        self._oversized.move_to_end(user_id)
+        # Forgetting a user only costs one more capped load query
+        while len(self._oversized) > _MAX_OVERSIZED_USERS:
+            self._oversized.popitem(last=False)
+
+    def _evict(self):
+        # Always keep the most recently used user, even if it alone is over budget
+        while self._bytes > self.max_bytes and len(self._users) > 1:
+            _, evicted = self._users.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+
+# Singleton instance
+user_embedding_cache = UserEmbeddingCache(
+    max_bytes=settings.USER_EMBEDDING_CACHE_MAX_BYTES,
+    max_rows_per_user=settings.USER_EMBEDDING_CACHE_MAX_ROWS,
+)
@@ -0,0 +1,155 @@
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+
+SEARCH_STRATEGIES = ("exact", "hnsw", "halfvec", "binary")
+DIMENSIONS = 384 # Entry.embedding; the compact indexes are built on casts to this size
+
+# Oldest pgvector release each strategy's operators and index types exist in
+MIN_PGVECTOR = {"exact": (0, 0), "hnsw": (0, 5), "halfvec": (0, 7), "binary": (0, 7)}
+ITERATIVE_SCAN_PGVECTOR = (0, 8)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize along the last axis (zero vectors stay zero), as float32."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def required_pgvector(strategy: str, iterative_scan: str) -> Tuple[int, int]:
+    required = MIN_PGVECTOR[strategy]
+    if strategy != "exact" and iterative_scan != "off":
+        required = max(required, ITERATIVE_SCAN_PGVECTOR)
+    return required
+
+
+async def check_pgvector(conn) -> Optional[str]:
+    """
+    Fall back to the exact strategy if the installed extension is too old.
+
+    ALTER EXTENSION vector UPDATE can only go as far as the server's library,
+    and an unsupported setting or operator would otherwise fail every query
+    (silently disabling novelty checks, which fail open). Run at startup after
+    the schema upgrades; returns a warning to log when it falls back.
+    """
+    strategy = settings.VECTOR_SEARCH_STRATEGY
+    required = required_pgvector(strategy, settings.HNSW_ITERATIVE_SCAN)
+    version = await conn.scalar(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+    installed = tuple(int(part) for part in re.findall(r"\d+", version or "")[:2])
+    if installed >= required:
+        return None
+
+    settings.VECTOR_SEARCH_STRATEGY = "exact"
+    return (
+        f"pgvector {version or 'not installed'} is older than the "
+        f"{'.'.join(map(str, required))} needed for VECTOR_SEARCH_STRATEGY={strategy!r} "
+        f"(HNSW_ITERATIVE_SCAN={settings.HNSW_ITERATIVE_SCAN!r}); using 'exact' instead"
+    )
+
+
+async def nearest_entries(
+    db: AsyncSession,
+    user_id: UUID,
+    embedding: np.ndarray,
+    k: int = 1,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    strategy: Optional[str] = None,
+) -> List:
+    """
+    Return the user's k entries closest to `embedding` by cosine distance.
+
+    Strategies (VECTOR_SEARCH_STRATEGY):
+        exact: scan only the user's rows (via idx_user_date) and sort them.
+            Perfect recall; cost grows with the size of that user's history.
+        hnsw: walk the cosine HNSW index with pgvector iterative scans, so the
+            user_id filter keeps pulling candidates until k rows match instead
+            of filtering a fixed global top-ef_search and losing recall.
+        halfvec: the same walk over an index of half-precision casts, half
+            the size. Returned distances are still computed on float32.
+        binary: walk a Hamming index of binary-quantized vectors (1 bit per
+            dimension) for k * BINARY_RERANK_FACTOR candidates, then rerank
+            them by exact cosine distance.
+
+    Only entries embedded with EMBEDDING_MODEL_VERSION are considered.
+    Rows have id, date, content, word_count and distance.
+    """
+    strategy = strategy or settings.VECTOR_SEARCH_STRATEGY
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown vector search strategy: {strategy!r}")
+
+    # Vectors from another model version aren't comparable
+    filters = ["user_id = :user_id", "embedding_model_version = :model_version"]
+    params = {
+        'embedding': str(np.asarray(embedding).tolist()),
+        'user_id': user_id,
+        'model_version': settings.EMBEDDING_MODEL_VERSION,
+        'k': k,
+    }
+    if start_date:
+        filters.append("date >= :start_date")
+        params['start_date'] = start_date
+    if end_date:
+        filters.append("date <= :end_date")
+        params['end_date'] = end_date
+    where = " AND ".join(filters)
+
+    if strategy == "exact":
+        query = f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT id, date, content, word_count, embedding
+                FROM entries
+                WHERE {where}
+            )
+            SELECT id, date, content, word_count, (embedding <=> CAST(:embedding AS vector)) AS distance
+            FROM candidates
+            ORDER BY distance ASC
+            LIMIT :k
+        """
+    else:
+        params['candidates'] = k
+        if strategy == "binary":
+            params['candidates'] = k * settings.BINARY_RERANK_FACTOR
+            order_by = (f"binary_quantize(embedding)::bit({DIMENSIONS}) "
+                        f"<~> binary_quantize(CAST(:embedding AS vector))::bit({DIMENSIONS})")
+        elif strategy == "halfvec":
+            order_by = f"embedding::halfvec({DIMENSIONS}) <=> CAST(:embedding AS halfvec({DIMENSIONS}))"
+        else:
+            order_by = "embedding <=> CAST(:embedding AS vector)"
+
+        # Transaction-local equivalent of SET LOCAL, in a single round trip
+        # (the settings apply to every HNSW index)
+        configs = ["set_config('hnsw.ef_search', :ef_search, true)"]
+        config_params = {
+            # A scan returns at most ef_search rows without iterative scans
+            'ef_search': str(max(settings.HNSW_EF_SEARCH, params['candidates'])),
+        }
+        if settings.HNSW_ITERATIVE_SCAN != "off":
+            # hnsw.iterative_scan only exists from pgvector 0.8
+            configs.append("set_config('hnsw.iterative_scan', :iterative_scan, true)")
+            config_params['iterative_scan'] = settings.HNSW_ITERATIVE_SCAN
+        await db.execute(text("SELECT " + ", ".join(configs)), config_params)
+        # The outer sort restores exact order (relaxed_order scans, approximate
+        # distances) and, for binary, reranks the candidates
+        query = f"""
+            SELECT * FROM (
+                SELECT id, date, content, word_count, (embedding <=> CAST(:embedding AS vector)) AS distance
+                FROM entries
+                WHERE {where}
+                ORDER BY {order_by}
+                LIMIT :candidates
+            ) nearest
+            ORDER BY distance ASC
+            LIMIT :k
+        """
+
+    result = await db.execute(text(query), params)
+    return result.fetchall()
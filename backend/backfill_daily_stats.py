@@ -0,0 +1,38 @@
+import asyncio
+import os
+import sys
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.database import Base, engine
+from app.models import achievement, entry, outbox, stats, streak, user  # noqa: F401  (register tables)
+from app.services.daily_stats import BACKFILL_STATEMENTS
+
+
+async def backfill():
+    """
+    Rebuild user_daily_stats and user_stats_totals from `entries`.
+
+    Safe to re-run. Rows are overwritten from a snapshot of `entries`, so run
+    it before the new code takes writes (or re-run it once traffic is quiet):
+    an entry committed while a statement is running can be left out.
+    """
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for statement in BACKFILL_STATEMENTS:
+                result = await conn.execute(text(statement))
+                print(f"Upserted {result.rowcount} rows")
+        print("SUCCESS: analytics rollups rebuilt")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(backfill())
@@ -0,0 +1,107 @@
+"""
+Latency, throughput, memory and cosine parity of each embedding backend.
+
+Each backend is measured in a fresh process so RSS numbers are not shared.
+
+Usage (from backend/):
+    python benchmarks/bench_embedding_backends.py --backends torch,torch_int8,onnx,onnx_int8
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services.embedding_backends import EMBEDDING_BACKENDS
+
+SAMPLE = (
+    "Today I refactored the streak calculator in FastAPI and measured query latency "
+    "with EXPLAIN ANALYZE; the idx_user_date index cut it from 40ms to 3ms (variant {i})."
+)
+
+
+def _rss_mb():
+    # Linux; falls back to peak RSS elsewhere
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(backend, texts, queue):
+    from app.services.embedding_backends import load_embedding_model
+
+    baseline = _rss_mb()
+    started = time.perf_counter()
+    try:
+        model = load_embedding_model(settings.EMBEDDING_MODEL_NAME, backend, settings.EMBEDDING_ONNX_FILE)
+    except Exception as e:
+        queue.put({"error": str(e)})
+        return
+    load_seconds = time.perf_counter() - started
+    model.encode(texts[:8])  # warm up
+
+    latencies = []
+    for text in texts[:100]:
+        started = time.perf_counter()
+        model.encode([text])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    embeddings = model.encode(texts, batch_size=32, normalize_embeddings=True)
+    throughput = len(texts) / (time.perf_counter() - started)
+
+    queue.put({
+        "load_s": load_seconds,
+        "rss_mb": _rss_mb() - baseline,
+        "p50_ms": statistics.median(latencies),
+        "throughput": throughput,
+        "embeddings": embeddings,
+    })
+
+
+def run(backend, texts):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(backend, texts, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main(args):
+    texts = [SAMPLE.format(i=i) for i in range(args.texts)]
+    reference = None
+
+    print(f"{'backend':<12} {'load s':>7} {'RSS MB':>8} {'p50 ms':>8} {'texts/s':>9} {'min cos':>8}")
+    for backend in args.backends:
+        result = run(backend, texts)
+        if "error" in result:
+            print(f"{backend:<12} unavailable: {result['error']}")
+            continue
+        if reference is None:
+            reference = result["embeddings"]
+        parity = np.sum(result["embeddings"] * reference, axis=1).min()
+        print(f"{backend:<12} {result['load_s']:7.2f} {result['rss_mb']:8.1f} "
+              f"{result['p50_ms']:8.2f} {result['throughput']:9.1f} {parity:8.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", type=lambda v: v.split(","), default=list(EMBEDDING_BACKENDS),
+                        help="Comma-separated; the first is the parity reference")
+    parser.add_argument("--texts", type=int, default=512)
+    main(parser.parse_args())
@@ -0,0 +1,128 @@
+"""
+Entry search: latency of the old ILIKE scan vs. the indexed full-text search.
+
+Builds synthetic entries in a scratch `bench` schema (the app's `entries` table
+is untouched), with the same generated search_vector column and GIN index as
+the app, and times both for a single user and across all users.
+
+Usage (from backend/):
+    python benchmarks/bench_entry_search.py --sizes 1000,100000,1000000 --users 1000
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.config import settings
+from app.models.entry import Entry
+from app.services.text_search import matches, search_entries
+
+VOCABULARY = (
+    "postgres index query planner vacuum python async await coroutine react hooks state "
+    "render docker container kubernetes deploy rollout cache latency throughput memory "
+    "garbage collector profiler benchmark compiler parser tokenizer embedding vector "
+    "cluster topic journal streak achievement habit morning running reading writing"
+).split()
+TERMS = ["postgres", "planner", "coroutine", "rollout", "profiler", "embedding", "habit"]
+
+
+async def build_table(engine, size, users):
+    print(f"Building bench.entries with {size} rows for {users} users...")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+        await conn.execute(text("DROP TABLE IF EXISTS bench.entries"))
+        await conn.execute(text("""
+            CREATE TABLE bench.entries (
+                id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id uuid NOT NULL,
+                content text NOT NULL,
+                date date NOT NULL DEFAULT current_date,
+                word_count integer NOT NULL DEFAULT 60,
+                search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+            )
+        """))
+        # ~60 random words per entry; the correlated subquery forces fresh text per row
+        await conn.execute(text("""
+            INSERT INTO bench.entries (user_id, content)
+            SELECT md5((i % :users)::text)::uuid,
+                   (SELECT string_agg((:vocabulary)[1 + floor(random() * array_length(:vocabulary, 1))::int], ' ')
+                    FROM generate_series(1, 60) WHERE i > 0)
+            FROM generate_series(1, :size) AS i
+        """), {'users': users, 'size': size, 'vocabulary': VOCABULARY})
+        await conn.execute(text("CREATE INDEX ON bench.entries (user_id, date)"))
+        await conn.execute(text("CREATE INDEX ON bench.entries USING gin (search_vector)"))
+        await conn.execute(text("ANALYZE bench.entries"))
+
+
+async def ilike_search(db, user_id, term, limit):
+    query = select(Entry.id).where(Entry.content.ilike(f"%{term}%")).limit(limit)
+    if user_id is not None:
+        query = query.where(Entry.user_id == user_id)
+    return (await db.execute(query)).fetchall()
+
+
+async def fts_search(db, user_id, term, limit):
+    if user_id is None:
+        return (await db.execute(select(Entry.id).where(matches(term)).limit(limit))).fetchall()
+    return await search_entries(db, user_id, term, limit)
+
+
+async def measure(engine, users, queries, search, per_user):
+    rng = np.random.default_rng(0)
+    latencies = []
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path = bench, public"))
+        await conn.commit()
+        async with AsyncSession(bind=conn) as db:
+            for i in range(queries):
+                # Matches md5((i % users)::text)::uuid used when seeding
+                user_id = uuid.UUID(hex=hashlib.md5(str(i % users).encode()).hexdigest()) if per_user else None
+                term = TERMS[int(rng.integers(len(TERMS)))]
+
+                started = time.perf_counter()
+                await search(db, user_id, term, 20)
+                latencies.append((time.perf_counter() - started) * 1000)
+                await db.rollback()
+    return latencies
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    try:
+        for size in args.sizes:
+            await build_table(engine, size, args.users)
+            print(f"\n{size} rows ({size // args.users} per user)")
+            for scope, per_user in (("user", True), ("global", False)):
+                for name, search in (("ilike", ilike_search), ("fts", fts_search)):
+                    latencies = await measure(engine, args.users, args.queries, search, per_user)
+                    p95 = statistics.quantiles(latencies, n=20)[-1]
+                    print(f"  {scope:<6} {name:<5} p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main(parser.parse_args()))
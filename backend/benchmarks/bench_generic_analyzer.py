@@ -0,0 +1,43 @@
+"""
+Per-entry cost of the generic-content heuristics: compiled analyzer vs. the legacy reference.
+
+The legacy implementation and the sample corpus live in
+tests/test_generic_analyzer.py, which also checks that both give identical results.
+
+Usage (from backend/):
+    python benchmarks/bench_generic_analyzer.py --entries 200 --repeat 5
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# Add parent directory (and tests/, for the reference) to path so we can import app modules
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "tests"))
+
+from app.services.generic_analyzer import analyze_generic
+from test_generic_analyzer import SAMPLES, _random_entries, legacy_is_generic
+
+
+def main(args):
+    corpus = SAMPLES + _random_entries(args.entries, seed=1)
+
+    def run(analyze):
+        for content in corpus:
+            analyze(content)
+
+    # Best of several repeats to keep scheduler noise out of the comparison
+    per_entry = 1e6 / (args.number * len(corpus))
+    for label, analyze in (("legacy", legacy_is_generic), ("compiled", analyze_generic)):
+        best = min(timeit.repeat(lambda: run(analyze), number=args.number, repeat=args.repeat))
+        print(f"{label:<9} {best * per_entry:7.1f} us/entry")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200, help="random entries added to the samples")
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,119 @@
+"""
+Per-user nearest-neighbour search: latency and recall@1 of each strategy vs. exact.
+
+Builds synthetic data in a scratch `bench` schema (the app's `entries` table is
+untouched) and runs services.vector_search.nearest_entries against it.
+
+Usage (from backend/, against a pgvector >= 0.8 database):
+    python benchmarks/bench_novelty_search.py --sizes 1000,100000,1000000 --users 1000
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.config import settings
+from app.database import VECTOR_INDEX_UPGRADES
+from app.services.vector_search import nearest_entries, SEARCH_STRATEGIES
+
+DIMENSIONS = 384
+
+
+async def build_table(engine, size, users):
+    print(f"Building bench.entries with {size} rows for {users} users...")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+        await conn.execute(text("DROP TABLE IF EXISTS bench.entries"))
+        await conn.execute(text(f"""
+            CREATE TABLE bench.entries (
+                id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id uuid NOT NULL,
+                content text NOT NULL DEFAULT '',
+                date date NOT NULL DEFAULT current_date,
+                word_count integer NOT NULL DEFAULT 0,
+                embedding vector({DIMENSIONS}) NOT NULL,
+                embedding_model_version varchar(100) NOT NULL DEFAULT '{settings.EMBEDDING_MODEL_VERSION}'
+            )
+        """))
+        # Random unit vectors, generated server-side; the correlated subquery
+        # forces a fresh vector per row
+        await conn.execute(text(f"""
+            INSERT INTO bench.entries (user_id, embedding)
+            SELECT md5((i % :users)::text)::uuid,
+                   l2_normalize((SELECT array_agg(random() - 0.5) FROM generate_series(1, {DIMENSIONS}) WHERE i > 0)::vector)
+            FROM generate_series(1, :size) AS i
+        """), {'users': users, 'size': size})
+        await conn.execute(text("CREATE INDEX ON bench.entries (user_id, date)"))
+        await conn.execute(text("CREATE INDEX ON bench.entries USING hnsw (embedding vector_cosine_ops)"))
+        # The app's halfvec and binary expression indexes, built on bench.entries
+        await conn.execute(text("SET LOCAL search_path = bench, public"))
+        for statements in VECTOR_INDEX_UPGRADES.values():
+            for statement in statements:
+                await conn.execute(text(statement))
+        await conn.execute(text("ANALYZE bench.entries"))
+
+
+async def measure(engine, users, queries, strategy):
+    rng = np.random.default_rng(0)
+    latencies, results = [], []
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path = bench, public"))
+        await conn.commit()
+        async with AsyncSession(bind=conn) as db:
+            for i in range(queries):
+                # Matches md5((i % users)::text)::uuid used when seeding
+                user_id = uuid.UUID(hex=hashlib.md5(str(i % users).encode()).hexdigest())
+                vector = rng.standard_normal(DIMENSIONS)
+                vector /= np.linalg.norm(vector)
+
+                started = time.perf_counter()
+                rows = await nearest_entries(db, user_id, vector, k=1, strategy=strategy)
+                latencies.append((time.perf_counter() - started) * 1000)
+                results.append(rows[0].id if rows else None)
+                await db.rollback()
+    return latencies, results
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    try:
+        for size in args.sizes:
+            await build_table(engine, size, args.users)
+            _, exact_ids = await measure(engine, args.users, args.queries, "exact")
+
+            print(f"\n{size} rows ({size // args.users} per user)")
+            for strategy in SEARCH_STRATEGIES:
+                latencies, ids = await measure(engine, args.users, args.queries, strategy)
+                recall = sum(a == b for a, b in zip(ids, exact_ids)) / len(ids)
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                print(f"  {strategy:<6} p50 {statistics.median(latencies):7.2f} ms   "
+                      f"p95 {p95:7.2f} ms   recall@1 {recall:.3f}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main(parser.parse_args()))
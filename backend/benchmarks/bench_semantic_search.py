@@ -0,0 +1,111 @@
+"""
+GET /entries/semantic latency: query encode (cold vs. cached) plus top-k search.
+
+History sizes are per user (a daily journaler writes ~365 entries a year).
+Reuses the scratch `bench` schema from bench_novelty_search; the app's
+`entries` table is untouched. Loads the embedding model.
+
+Usage (from backend/, against a pgvector >= 0.8 database):
+    python benchmarks/bench_semantic_search.py --histories 100,1000,5000 --users 200 --k 10
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import statistics
+import sys
+import time
+import uuid
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.config import settings
+from app.services.ai_validator import ai_validator
+from app.services.embedding_cache import EmbeddingCache
+from app.services.vector_search import nearest_entries, SEARCH_STRATEGIES
+from bench_novelty_search import build_table
+
+QUERIES = [
+    "what did I learn about postgres indexes",
+    "async python and the event loop",
+    "debugging react rendering",
+    "kubernetes rollouts that went wrong",
+    "profiling memory usage",
+]
+
+
+def report(label, latencies):
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(f"  {label:<14} p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+async def measure_encode(queries):
+    cache = EmbeddingCache(model_name="bench", max_entries=len(QUERIES))
+    cold, cached = [], []
+    for i in range(queries):
+        query = QUERIES[i % len(QUERIES)]
+        started = time.perf_counter()
+        # A unique suffix misses the cache every time
+        await ai_validator.encode(f"{query} #{i}", cache=cache)
+        cold.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await ai_validator.encode(query, cache=cache)
+        cached.append((time.perf_counter() - started) * 1000)
+    return cold, cached
+
+
+async def measure_search(engine, users, queries, k, strategy):
+    embeddings = [await ai_validator.encode(query) for query in QUERIES]
+    latencies = []
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path = bench, public"))
+        await conn.commit()
+        async with AsyncSession(bind=conn) as db:
+            for i in range(queries):
+                # Matches md5((i % users)::text)::uuid used when seeding
+                user_id = uuid.UUID(hex=hashlib.md5(str(i % users).encode()).hexdigest())
+                started = time.perf_counter()
+                await nearest_entries(db, user_id, embeddings[i % len(embeddings)], k=k, strategy=strategy)
+                latencies.append((time.perf_counter() - started) * 1000)
+                await db.rollback()
+    return latencies
+
+
+async def main(args):
+    print("Loading model...")
+    await ai_validator.encode("warm up")
+    print("\nQuery encode")
+    cold, cached = await measure_encode(args.queries)
+    report("cold", cold)
+    report("cached", cached)
+
+    engine = create_async_engine(args.database_url)
+    try:
+        for history in args.histories:
+            await build_table(engine, history * args.users, args.users)
+            print(f"\n{history} entries per user, k={args.k}")
+            for strategy in SEARCH_STRATEGIES:
+                report(strategy, await measure_search(engine, args.users, args.queries, args.k, strategy))
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--histories", type=lambda v: [int(s) for s in v.split(",")], default=[100, 1000, 5000])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=settings.SEMANTIC_SEARCH_DEFAULT_K)
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main(parser.parse_args()))
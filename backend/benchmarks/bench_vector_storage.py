@@ -0,0 +1,139 @@
+"""
+Compact embedding storage: size, novelty-check latency and accuracy per strategy.
+
+Compares the float32 column and its HNSW index with the halfvec and
+binary-quantized expression indexes (services/vector_search.py). Novelty
+queries are noisy copies of a stored entry, so the nearest match sits near the
+0.85 duplicate threshold, where precision loss would flip verdicts. Uses the
+scratch `bench` schema from bench_novelty_search.
+
+Usage (from backend/, against a pgvector >= 0.8 database):
+    python benchmarks/bench_vector_storage.py --sizes 100000,1000000 --users 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.config import settings
+from app.services.ai_validator import ai_validator
+from app.services.vector_search import nearest_entries, SEARCH_STRATEGIES, DIMENSIONS
+from bench_novelty_search import build_table
+
+INDEXES = {
+    "hnsw": "entries_embedding_idx",
+    "halfvec": "idx_embedding_halfvec_hnsw",
+    "binary": "idx_embedding_binary_hnsw",
+}
+
+
+async def report_storage(conn):
+    sizes = (await conn.execute(text(f"""
+        SELECT avg(pg_column_size(embedding)) AS vector,
+               avg(pg_column_size(embedding::halfvec({DIMENSIONS}))) AS halfvec,
+               avg(pg_column_size(binary_quantize(embedding)::bit({DIMENSIONS}))) AS binary
+        FROM (SELECT embedding FROM bench.entries LIMIT 10000) sample
+    """))).fetchone()
+    print(f"  value bytes   vector {sizes.vector:.0f}   halfvec {sizes.halfvec:.0f}   binary {sizes.binary:.0f}")
+    table = (await conn.execute(text("SELECT pg_table_size('bench.entries')"))).scalar()
+    print(f"  table         {table / 2**20:9.1f} MB")
+    for strategy, index in INDEXES.items():
+        size = (await conn.execute(text("SELECT pg_relation_size(CAST(:index AS regclass))"), {'index': f"bench.{index}"})).scalar()
+        print(f"  {strategy:<7} index {size / 2**20:9.1f} MB")
+
+
+async def report_similarity_error(conn, pairs):
+    """Cosine similarity from halfvec casts vs. float32, over random stored pairs."""
+    row = (await conn.execute(text(f"""
+        WITH sample AS (SELECT embedding FROM bench.entries ORDER BY random() LIMIT :n),
+        pairs AS (SELECT embedding AS a, lead(embedding) OVER () AS b FROM sample)
+        SELECT avg(abs(error)) AS mean, max(abs(error)) AS max FROM (
+            SELECT (a <=> b) - (a::halfvec({DIMENSIONS}) <=> b::halfvec({DIMENSIONS})) AS error
+            FROM pairs
+            WHERE b IS NOT NULL
+        ) errors
+    """), {'n': pairs})).fetchone()
+    print(f"  halfvec |similarity error|  mean {row.mean:.2e}   max {row.max:.2e}")
+
+
+async def novelty_queries(conn, queries, noise):
+    """(user_id, query) pairs: a stored vector plus noise, re-normalized."""
+    rows = (await conn.execute(text("""
+        SELECT user_id, embedding::text AS embedding FROM bench.entries ORDER BY random() LIMIT :n
+    """), {'n': queries})).fetchall()
+    rng = np.random.default_rng(0)
+    pairs = []
+    for row in rows:
+        vector = np.asarray(json.loads(row.embedding), dtype=np.float32)
+        vector += rng.standard_normal(DIMENSIONS).astype(np.float32) * noise
+        pairs.append((row.user_id, vector / np.linalg.norm(vector)))
+    return pairs
+
+
+async def measure(engine, pairs, strategy):
+    latencies, matches = [], []
+    async with engine.connect() as conn:
+        await conn.execute(text("SET search_path = bench, public"))
+        await conn.commit()
+        async with AsyncSession(bind=conn) as db:
+            for user_id, vector in pairs:
+                started = time.perf_counter()
+                rows = await nearest_entries(db, user_id, vector, k=1, strategy=strategy)
+                latencies.append((time.perf_counter() - started) * 1000)
+                matches.append((rows[0].id, 1 - rows[0].distance) if rows else (None, 0.0))
+                await db.rollback()
+    return latencies, matches
+
+
+async def main(args):
+    engine = create_async_engine(args.database_url)
+    threshold = ai_validator.similarity_threshold
+    try:
+        for size in args.sizes:
+            await build_table(engine, size, args.users)
+            print(f"\n{size} rows ({size // args.users} per user)")
+            async with engine.connect() as conn:
+                await report_storage(conn)
+                await report_similarity_error(conn, args.pairs)
+                pairs = await novelty_queries(conn, args.queries, args.noise)
+
+            _, exact = await measure(engine, pairs, "exact")
+            print(f"  mean nearest similarity {statistics.mean(s for _, s in exact):.3f} (threshold {threshold})")
+            for strategy in SEARCH_STRATEGIES:
+                latencies, found = await measure(engine, pairs, strategy)
+                recall = sum(a[0] == b[0] for a, b in zip(found, exact)) / len(found)
+                # Same duplicate verdict as the exact float32 search
+                agreement = sum((a[1] >= threshold) == (b[1] >= threshold) for a, b in zip(found, exact)) / len(found)
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                print(f"  {strategy:<7} p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms   "
+                      f"recall@1 {recall:.3f}   verdict agreement {agreement:.3f}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=[100_000, 1_000_000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=0.03, help="per-dimension noise on novelty queries")
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, desc
+
+from app.database import AsyncSessionLocal, engine
+from app.models import achievement, entry, streak, user  # noqa: F401  (register mappers)
+from app.models.entry import Entry
+from app.models.streak import StreakData
+from app.services.streak_calculator import (
+    calculate_streak,
+    effective_current_streak,
+    summarize_dates,
+)
+
+
+def find_mismatches(streak_data, expected):
+    """Fields where the stored StreakData row disagrees with the full recompute."""
+    if streak_data is None:
+        return ["missing row"]
+
+    stored = {
+        "current_streak": effective_current_streak(
+            streak_data.last_entry_date, streak_data.current_run_start
+        ),
+        "last_entry_date": streak_data.last_entry_date,
+        "current_run_start": streak_data.current_run_start,
+        "total_entries": streak_data.total_entries,
+    }
+    mismatches = [
+        f"{field}: stored {stored[field]}, expected {getattr(expected, field)}"
+        for field in stored
+        if stored[field] != getattr(expected, field)
+    ]
+    if (streak_data.longest_streak or 0) < expected.current_streak:
+        mismatches.append(
+            f"longest_streak: stored {streak_data.longest_streak}, below current {expected.current_streak}"
+        )
+    return mismatches
+
+
+async def reconcile(fix: bool):
+    """Compare every user's incremental StreakData against a full recompute."""
+    checked = mismatched = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            user_ids = (await db.execute(select(Entry.user_id).distinct())).scalars().all()
+
+            for user_id in user_ids:
+                result = await db.execute(
+                    select(Entry.date)
+                    .where(Entry.user_id == user_id)
+                    .distinct()
+                    .order_by(desc(Entry.date))
+                )
+                expected = summarize_dates([row[0] for row in result.fetchall()])
+                streak_data = await db.scalar(
+                    select(StreakData).where(StreakData.user_id == user_id)
+                )
+                checked += 1
+
+                mismatches = find_mismatches(streak_data, expected)
+                if not mismatches:
+                    continue
+                mismatched += 1
+                print(f"{user_id}: " + "; ".join(mismatches))
+                if fix:
+                    await calculate_streak(user_id, db)
+                else:
+                    # Don't hold the row snapshot open across users
+                    await db.rollback()
+    finally:
+        await engine.dispose()
+
+    action = "fixed" if fix else "found"
+    print(f"Checked {checked} users, {action} {mismatched} mismatched streaks")
+    return mismatched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Verify incrementally maintained streaks against a full recompute."
+    )
+    parser.add_argument("--fix", action="store_true", help="rewrite mismatched rows from the full recompute")
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    mismatched = asyncio.run(reconcile(args.fix))
+    sys.exit(1 if mismatched and not args.fix else 0)
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models import achievement, entry, outbox, stats, streak, user  # noqa: F401  (register mappers)
+from app.models.entry import Entry
+from app.services.ai_validator import ai_validator
+from app.services.embedding_executor import EmbeddingExecutor
+
+
+def needs_reembed(version: str):
+    """Rows whose embedding came from another (or an unrecorded) model version."""
+    return Entry.embedding_model_version.is_distinct_from(version)
+
+
+def revalidation_failures(rows):
+    """(row, reason) for entries the current length/generic rules would reject."""
+    failures = []
+    for row in rows:
+        if len(row.content.split()) < ai_validator.min_word_count:
+            failures.append((row, "too_short"))
+        elif ai_validator._is_generic(row.content)[0]:
+            failures.append((row, "generic"))
+    return failures
+
+
+async def reembed(version: str, batch_size: int, workers: int, revalidate: bool):
+    """
+    Re-encode every entry not yet at `version`, batch_size texts per worker job.
+
+    Progress is the version column itself: finished rows drop out of the
+    selection, so an interrupted run resumes where it stopped. The next page
+    is read while the current one is encoding.
+    """
+    executor = EmbeddingExecutor("process", workers, max_pending=workers)
+    page_size = batch_size * workers
+    done = flagged = 0
+    started = time.perf_counter()
+
+    async def fetch(db, after):
+        query = select(Entry.id, Entry.user_id, Entry.content).where(needs_reembed(version))
+        if after is not None:
+            query = query.where(Entry.id > after)
+        return (await db.execute(query.order_by(Entry.id).limit(page_size))).fetchall()
+
+    try:
+        async with AsyncSessionLocal() as db:
+            remaining = await db.scalar(select(func.count()).select_from(Entry).where(needs_reembed(version)))
+            print(f"{remaining} entries to re-embed with {version!r} ({workers} workers)")
+
+            rows = await fetch(db, None)
+            while rows:
+                chunks = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+                encoding = asyncio.gather(*(executor.encode([row.content for row in chunk]) for chunk in chunks))
+                next_rows = await fetch(db, rows[-1].id)
+                encoded = await encoding
+
+                # ORM bulk UPDATE by primary key: one executemany per page
+                await db.execute(update(Entry), [
+                    {'id': row.id, 'embedding': embedding, 'embedding_model_version': version}
+                    for chunk, embeddings in zip(chunks, encoded)
+                    for row, embedding in zip(chunk, embeddings)
+                ])
+                await db.commit()
+
+                if revalidate:
+                    for row, reason in revalidation_failures(rows):
+                        flagged += 1
+                        print(f"  {row.id} (user {row.user_id}): {reason}")
+
+                done += len(rows)
+                rate = done / (time.perf_counter() - started)
+                print(f"Re-embedded {done}/{remaining} ({rate:.0f} entries/s)")
+                rows = next_rows
+    finally:
+        executor.shutdown()
+        await engine.dispose()
+
+    if revalidate:
+        print(f"{flagged} re-embedded entries would now be rejected (left in place)")
+    if done:
+        # Rewriting most vectors leaves the HNSW graph bloated
+        print("Consider REINDEX INDEX CONCURRENTLY idx_embedding_hnsw")
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-embed entries after an embedding model change (resumable)."
+    )
+    parser.add_argument("--version", default=settings.EMBEDDING_MODEL_VERSION,
+                        help="version to record; must match the model the workers load (default: EMBEDDING_MODEL_VERSION)")
+    parser.add_argument("--batch-size", type=int, default=256, help="texts per encode job")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="encoder processes")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="also report entries the current length/generic rules would reject")
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(reembed(args.version, args.batch_size, args.workers, args.revalidate))
@@ -0,0 +1,153 @@
+import hashlib
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+# Import every model so SQLAlchemy can resolve string relationships
+from app.models import achievement, entry, outbox, stats, streak, user  # noqa: F401
+from app.services.ai_validator import ai_validator
+from app.services.embedding_cache import embedding_cache, query_embedding_cache
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer that records encode calls."""
+
+    dimension = 384
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.calls.append(batch)
+        vectors = np.stack([self._vector(text) for text in batch])
+        return vectors[0] if single else vectors
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+class FakeResult:
+    def __init__(self, rows=None):
+        self._rows = rows or []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def all(self):
+        return list(self._rows)
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def scalars(self):
+        return self
+
+    @property
+    def rowcount(self):
+        # For DML, the given rows stand for the affected rows
+        return len(self._rows)
+
+
+class FakeStreamResult:
+    """AsyncResult stand-in; partitions() honours the statement's yield_per."""
+
+    def __init__(self, rows, size):
+        self._rows = rows
+        self._size = size
+
+    async def partitions(self, size=None):
+        size = size or self._size
+        batch = []
+        for row in self._rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+class FakeSession:
+    """
+    Minimal AsyncSession stand-in: records added objects and SQL.
+
+    Each execute() pops the next list of rows from `results`; once those run
+    out every query returns no rows. scalar() pops the same way and returns
+    the first row as-is, so its results are given as bare values.
+    """
+
+    def __init__(self, results=None):
+        self.added = []
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.savepoints = 0
+        self.results = list(results or [])
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+        return FakeResult(self.results.pop(0) if self.results else None)
+
+    async def stream(self, statement, params=None):
+        """Like execute(); the popped rows may be any iterable (e.g. a generator)."""
+        self.executed.append((statement, params))
+        size = statement.get_execution_options().get("yield_per", 100)
+        return FakeStreamResult(self.results.pop(0) if self.results else [], size)
+
+    def begin_nested(self):
+        """Savepoint stand-in; exceptions propagate like a rolled-back savepoint."""
+        self.savepoints += 1
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def scalar(self, statement, params=None):
+        return (await self.execute(statement, params)).fetchone()
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def flush(self):
+        for obj in self.added:
+            if getattr(obj, "id", None) is None:
+                obj.id = uuid.uuid4()
+
+    async def refresh(self, obj):
+        if getattr(obj, "id", None) is None:
+            obj.id = uuid.uuid4()
+        if getattr(obj, "created_at", None) is None:
+            obj.created_at = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def fake_db():
+    return FakeSession()
+
+
+@pytest.fixture
+def fake_model():
+    previous = ai_validator._model
+    model = FakeModel()
+    ai_validator._model = model
+    embedding_cache.clear()
+    query_embedding_cache.clear()
+    yield model
+    ai_validator._model = previous
+    embedding_cache.clear()
+    query_embedding_cache.clear()
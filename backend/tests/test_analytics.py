@@ -0,0 +1,91 @@
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from conftest import FakeSession
+
+from app.routers import analytics
+from app.services.topic_engine import topic_engine
+
+TODAY = date.today()
+
+
+def dashboard_row(**overrides):
+    """What the dashboard query returns for a user with no data at all."""
+    row = dict(
+        week_entries=None, month_entries=None,
+        activity_dates=None, activity_words=None, activity_entries=None,
+        total_entries=None, total_words=None,
+        last_entry_date=None, current_run_start=None, longest_streak=None,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+@pytest.fixture(autouse=True)
+def cached_topics(monkeypatch):
+    async def top_topics(db, user_id):
+        return ["Postgres"]
+
+    monkeypatch.setattr(topic_engine, "top_topics", top_topics)
+
+
+ACTIVE_ROW = dashboard_row(
+    week_entries=3, month_entries=8,
+    activity_dates=[TODAY - timedelta(days=3), TODAY],
+    activity_words=[40, 120], activity_entries=[1, 2],
+    total_entries=8, total_words=500,
+    last_entry_date=TODAY, current_run_start=TODAY - timedelta(days=1), longest_streak=5,
+)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_is_one_query():
+    db = FakeSession(results=[[ACTIVE_ROW]])
+
+    dashboard = await analytics.get_dashboard(uuid.uuid4(), db)
+
+    assert len(db.executed) == 1
+    assert dashboard["summary"]["entries_this_week"] == 3
+    assert dashboard["summary"]["entries_this_month"] == 8
+    assert dashboard["summary"]["avg_word_count"] == 62.5
+    assert dashboard["summary"]["top_topics"] == ["Postgres"]
+    assert dashboard["stats"] == {"total_entries": 8, "total_words": 500, "level": 1}
+    assert dashboard["streak"] == {"current_streak": 2, "longest_streak": 5}
+
+    activity = dashboard["activity"]
+    assert len(activity) == 7
+    assert activity[-1] == {"date": TODAY.strftime("%a"), "words": 120, "entries": 2}
+    assert activity[3]["entries"] == 1
+    assert sum(day["entries"] for day in activity) == 3
+
+
+@pytest.mark.asyncio
+async def test_endpoints_match_dashboard_sections():
+    user_id = uuid.uuid4()
+    dashboard = await analytics.get_dashboard(user_id, FakeSession(results=[[ACTIVE_ROW]]))
+
+    assert await analytics.get_analytics_summary(user_id, FakeSession(results=[[ACTIVE_ROW]])) == dashboard["summary"]
+    assert await analytics.get_user_stats(user_id, FakeSession(results=[[ACTIVE_ROW]])) == dashboard["stats"]
+    assert await analytics.get_weekly_activity(user_id, FakeSession(results=[[ACTIVE_ROW]])) == dashboard["activity"]
+
+
+@pytest.mark.asyncio
+async def test_user_without_entries():
+    dashboard = await analytics.get_dashboard(uuid.uuid4(), FakeSession(results=[[dashboard_row()]]))
+
+    assert dashboard["stats"] == {"total_entries": 0, "total_words": 0, "level": 1}
+    assert dashboard["summary"]["avg_word_count"] == 0
+    assert dashboard["streak"] == {"current_streak": 0, "longest_streak": 0}
+    assert all(day["entries"] == 0 for day in dashboard["activity"])
+
+
+def test_analytics_endpoints_use_read_sessions():
+    from app.database import get_read_db
+
+    routes = [route for route in analytics.router.routes if "GET" in route.methods]
+
+    assert routes
+    for route in routes:
+        assert [dep.call for dep in route.dependant.dependencies] == [get_read_db], route.path
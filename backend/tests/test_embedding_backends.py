@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.embedding_backends import load_embedding_model
+
+SENTENCES = [
+    "This morning I debugged the FastAPI lifespan hook for 2 hours.",
+    "Learned how HNSW graphs trade recall for latency via ef_search.",
+    "Practiced 30 minutes of Spanish verb conjugations with flashcards.",
+    "Refactored the streak calculator to update incrementally on insert.",
+]
+
+# Minimum per-sentence cosine similarity to the reference torch embeddings
+PARITY_THRESHOLDS = {
+    "torch_int8": 0.97,
+    "onnx": 0.999,
+    "onnx_int8": 0.97,
+}
+
+
+def _load_or_skip(backend):
+    try:
+        return load_embedding_model(settings.EMBEDDING_MODEL_NAME, backend, settings.EMBEDDING_ONNX_FILE)
+    except Exception as e:  # weights not downloadable or optional deps missing
+        pytest.skip(f"{backend} backend unavailable: {e}")
+
+
+@pytest.fixture(scope="module")
+def reference_embeddings():
+    return _load_or_skip("torch").encode(SENTENCES, normalize_embeddings=True)
+
+
+@pytest.mark.parametrize("backend", sorted(PARITY_THRESHOLDS))
+def test_backend_matches_reference(backend, reference_embeddings):
+    embeddings = _load_or_skip(backend).encode(SENTENCES, normalize_embeddings=True)
+
+    similarities = np.sum(embeddings * reference_embeddings, axis=1)
+    assert similarities.min() >= PARITY_THRESHOLDS[backend]
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        load_embedding_model(settings.EMBEDDING_MODEL_NAME, "tensorflow")
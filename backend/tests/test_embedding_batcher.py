@@ -0,0 +1,69 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch(fake_model):
+    async def encode_batch(texts):
+        return fake_model.encode(texts)
+
+    batcher = EmbeddingBatcher(encode_batch, max_batch_size=8, max_wait_ms=20)
+    texts = [f"Entry number {i} about pgvector indexes" for i in range(5)]
+
+    results = await asyncio.gather(*(batcher.encode(text) for text in texts))
+
+    assert fake_model.calls == [texts]
+    for text, embedding in zip(texts, results):
+        np.testing.assert_array_equal(embedding, fake_model.encode(text))
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting(fake_model):
+    async def encode_batch(texts):
+        return fake_model.encode(texts)
+
+    batcher = EmbeddingBatcher(encode_batch, max_batch_size=2, max_wait_ms=10_000)
+
+    await asyncio.wait_for(
+        asyncio.gather(batcher.encode("first text"), batcher.encode("second text")),
+        timeout=1,
+    )
+
+    assert fake_model.calls == [["first text", "second text"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_every_caller():
+    async def encode_batch(texts):
+        raise RuntimeError("model crashed")
+
+    batcher = EmbeddingBatcher(encode_batch, max_batch_size=8, max_wait_ms=1)
+
+    results = await asyncio.gather(
+        batcher.encode("one"), batcher.encode("two"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_in_flight_batches_are_strongly_referenced():
+    release = asyncio.Event()
+
+    async def encode_batch(texts):
+        await release.wait()
+        return np.zeros((len(texts), 3))
+
+    batcher = EmbeddingBatcher(encode_batch, max_batch_size=1, max_wait_ms=1000)
+    pending = asyncio.ensure_future(batcher.encode("a"))
+    await asyncio.sleep(0)
+
+    assert len(batcher._running) == 1
+    release.set()
+    await pending
+    await asyncio.sleep(0)
+    assert batcher._running == set()
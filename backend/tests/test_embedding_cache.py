@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from app.services.ai_validator import ai_validator
+from app.services.embedding_cache import EmbeddingCache
+
+
+def test_lookup_ignores_case_and_whitespace():
+    cache = EmbeddingCache("test-model", max_entries=10)
+    cache.put("Fixed the  API bug\nin port 8000.", np.ones(4))
+
+    assert cache.get("fixed the api bug in port 8000.") is not None
+    assert cache.get("Fixed a different bug") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EmbeddingCache("test-model", max_entries=2)
+    cache.put("first", np.zeros(4))
+    cache.put("second", np.zeros(4))
+    cache.get("first")
+    cache.put("third", np.zeros(4))
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+
+def test_entries_persist_to_disk(tmp_path):
+    EmbeddingCache("test-model", max_entries=10, cache_dir=str(tmp_path)).put("persisted", np.arange(4))
+
+    restarted = EmbeddingCache("test-model", max_entries=10, cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(restarted.get("persisted"), np.arange(4))
+
+    other_model = EmbeddingCache("other-model", max_entries=10, cache_dir=str(tmp_path))
+    assert other_model.get("persisted") is None
+
+
+@pytest.mark.asyncio
+async def test_resubmitted_text_skips_the_model(fake_model):
+    first = await ai_validator.encode("Configured Nginx as a reverse proxy today.")
+    second = await ai_validator.encode("configured nginx as a reverse proxy today. ")
+
+    assert len(fake_model.calls) == 1
+    np.testing.assert_array_equal(first, second)
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.embedding_executor import EmbeddingExecutor, EmbeddingPoolSaturated
+
+
+@pytest.mark.asyncio
+async def test_encode_runs_off_event_loop(fake_model):
+    executor = EmbeddingExecutor(kind="thread", max_workers=1, max_pending=4)
+    seen_threads = []
+    original_encode = fake_model.encode
+
+    def recording_encode(texts, **kwargs):
+        seen_threads.append(threading.current_thread())
+        return original_encode(texts, **kwargs)
+
+    fake_model.encode = recording_encode
+    try:
+        embeddings = await executor.encode(["Debugged the Docker volume mapping"])
+    finally:
+        executor.shutdown()
+
+    assert embeddings.shape == (1, 384)
+    assert seen_threads and seen_threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_new_work(fake_model):
+    executor = EmbeddingExecutor(kind="thread", max_workers=1, max_pending=1)
+    release = threading.Event()
+    original_encode = fake_model.encode
+
+    def blocking_encode(texts, **kwargs):
+        release.wait(timeout=5)
+        return original_encode(texts, **kwargs)
+
+    fake_model.encode = blocking_encode
+    try:
+        first = asyncio.ensure_future(executor.encode(["first"]))
+        await asyncio.sleep(0)
+        assert executor.pending == 1
+
+        with pytest.raises(EmbeddingPoolSaturated):
+            await executor.encode(["second"])
+
+        release.set()
+        await first
+        assert executor.pending == 0
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,182 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from conftest import FakeSession
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import get_db
+from app.main import app
+from app.models.entry import Entry
+from app.models.outbox import OutboxTask
+from app.models.streak import StreakData
+from app.routers import entries as entries_router
+from app.schemas.entry import EntryBulkCreate, EntryCreate
+from app.services import gamification, streak_calculator
+from app.services.ai_validator import ai_validator
+from app.services.task_queue import task_queue
+
+
+SPECIFIC_CONTENT = (
+    "This morning I debugged the FastAPI lifespan hook for 2 hours and discovered "
+    "that the Postgres container was not ready, so I added a retry loop with 5 attempts."
+)
+
+
+@pytest.fixture
+def no_side_effects(monkeypatch):
+    async def fake_record_entry(user_id, entry_date, db, **kwargs):
+        return 1, 1
+
+    async def fake_check_achievements(user_id, db, **kwargs):
+        return []
+
+    monkeypatch.setattr(streak_calculator, "record_entry", fake_record_entry)
+    monkeypatch.setattr(gamification.gamification_service, "check_achievements", fake_check_achievements)
+
+
+@pytest.mark.asyncio
+async def test_create_entry_encodes_content_once(fake_model, fake_db, no_side_effects):
+    entry = EntryCreate(content=SPECIFIC_CONTENT, date=date.today())
+
+    created = await entries_router.create_entry(entry, uuid.uuid4(), fake_db)
+
+    assert fake_model.calls == [[SPECIFIC_CONTENT]]
+    stored = [obj for obj in fake_db.added if isinstance(obj, Entry)]
+    assert stored == [created]
+    assert list(created.embedding) == list(fake_model.encode(SPECIFIC_CONTENT))
+    assert created.embedding_model_version == settings.EMBEDDING_MODEL_VERSION
+
+
+@pytest.mark.asyncio
+async def test_create_entry_updates_daily_rollup_in_same_transaction(fake_model, fake_db, no_side_effects):
+    entry = EntryCreate(content=SPECIFIC_CONTENT, date=date(2025, 3, 1))
+    user_id = uuid.uuid4()
+
+    await entries_router.create_entry(entry, user_id, fake_db)
+
+    rollups = [params for stmt, params in fake_db.executed if "user_daily_stats" in str(stmt)]
+    assert rollups == [{'user_id': user_id, 'date': date(2025, 3, 1), 'word_count': 29}]
+    assert fake_db.commits == 1
+
+
+OTHER_CONTENT = (
+    "At 3pm I profiled the React dashboard with the Chrome Performance tab and found "
+    "that 14 components re-rendered on every keystroke, so I memoized the chart props."
+)
+
+
+def bulk(*contents):
+    return EntryBulkCreate(entries=[
+        EntryCreate(content=content, date=date(2025, 3, 1 + i)) for i, content in enumerate(contents)
+    ])
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_validates_and_inserts_in_batches(fake_model, no_side_effects):
+    db = FakeSession(results=[[]]) # No existing entries
+    user_id = uuid.uuid4()
+
+    response = await entries_router.create_entries_bulk(
+        bulk(SPECIFIC_CONTENT, "Too short to count.", SPECIFIC_CONTENT, OTHER_CONTENT), user_id, db
+    )
+
+    # Distinct texts are embedded in one call
+    assert fake_model.calls == [[SPECIFIC_CONTENT, OTHER_CONTENT]]
+    assert [(r["index"], r["reason"]) for r in response["rejected"]] == [(1, "too_short"), (2, "duplicate")]
+    assert "2025-03-01" in response["rejected"][1]["feedback"]
+
+    inserts = [params for stmt, params in db.executed if isinstance(params, list)]
+    assert len(inserts) == 1
+    assert [row["id"] for row in inserts[0]] == response["created"]
+    assert [row["content"] for row in inserts[0]] == [SPECIFIC_CONTENT, OTHER_CONTENT]
+    assert {row["embedding_model_version"] for row in inserts[0]} == {settings.EMBEDDING_MODEL_VERSION}
+    assert "entries.embedding_model_version =" in str(db.executed[0][0])
+
+    rollups = [params for stmt, params in db.executed if "user_daily_stats" in str(stmt)]
+    assert rollups == [{'user_id': user_id, 'dates': [date(2025, 3, 1), date(2025, 3, 4)], 'word_counts': [29, 27]}]
+    assert [task.kind for task in db.added if isinstance(task, OutboxTask)] == ["entries_imported"]
+    assert db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_rejects_repeats_of_existing_entries(fake_model, no_side_effects):
+    existing = SimpleNamespace(date=date(2024, 1, 5), content=OTHER_CONTENT, embedding=fake_model.encode(OTHER_CONTENT))
+    db = FakeSession(results=[[existing]])
+
+    response = await entries_router.create_entries_bulk(bulk(SPECIFIC_CONTENT, OTHER_CONTENT), uuid.uuid4(), db)
+
+    assert len(response["created"]) == 1
+    assert [(r["index"], r["reason"]) for r in response["rejected"]] == [(1, "duplicate")]
+    assert "2024-01-05" in response["rejected"][0]["feedback"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_is_capped(fake_db, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ENTRIES", 1)
+
+    with pytest.raises(HTTPException) as error:
+        await entries_router.create_entries_bulk(bulk(SPECIFIC_CONTENT, OTHER_CONTENT), uuid.uuid4(), fake_db)
+
+    assert error.value.status_code == 413
+    assert fake_db.executed == []
+
+
+def test_first_entry_without_streak_row_returns_created_entry(fake_model, monkeypatch):
+    async def fake_check_achievements(user_id, db, **kwargs):
+        return []
+
+    monkeypatch.setattr(gamification.gamification_service, "check_achievements", fake_check_achievements)
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_STRATEGY", "exact")
+    monkeypatch.setattr(task_queue, "inline", True)
+    entry_date = date.today()
+    # Text duplicates, nearest entries, rollup, StreakData (none), entry dates
+    db = FakeSession(results=[[], [], [], [], [(entry_date,)]])
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        response = TestClient(app).post(
+            "/api/v1/entries/",
+            params={"user_id": str(uuid.uuid4())},
+            json={"content": SPECIFIC_CONTENT, "date": entry_date.isoformat()},
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert response.status_code == 201
+    assert response.json()["content"] == SPECIFIC_CONTENT
+    assert response.json()["date"] == entry_date.isoformat()
+    # The streak fallback must not roll back the request's session
+    assert db.rollbacks == 0
+    streak = next(obj for obj in db.added if isinstance(obj, StreakData))
+    assert (streak.current_streak, streak.current_run_start) == (1, entry_date)
+
+
+class BrokenSearchSession(FakeSession):
+    """Every read fails, as if the vector or fingerprint query errored."""
+
+    async def execute(self, statement, params=None):
+        if "FROM entries" in str(statement):
+            raise RuntimeError("index unavailable")
+        return await super().execute(statement, params)
+
+    async def stream(self, statement, params=None):
+        raise RuntimeError("index unavailable")
+
+
+@pytest.mark.asyncio
+async def test_failed_lookups_fail_open_without_touching_the_callers_transaction(fake_model, monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_STRATEGY", "exact")
+    db = BrokenSearchSession()
+    pending = object()
+    db.add(pending)
+
+    single = await ai_validator.validate_entry(SPECIFIC_CONTENT, uuid.uuid4(), db)
+    batch = await ai_validator.validate_batch([OTHER_CONTENT], [date(2025, 3, 1)], uuid.uuid4(), db)
+
+    assert single.is_valid and batch[0].is_valid
+    assert db.rollbacks == 0
+    assert db.savepoints == 3
+    assert db.added == [pending]
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from conftest import FakeSession
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.routers import entries
+from app.routers.entries import EXPORT_COLUMNS, _export_chunks
+
+# Result rows are tuples with attribute access
+ExportRow = namedtuple("ExportRow", EXPORT_COLUMNS)
+CONTENT = "Profiled the export path, then rewrote it to stream with a server-side cursor. " * 5
+
+
+def make_rows(n):
+    """Rows generated lazily, like a server-side cursor would hand them out."""
+    start = date(2015, 1, 1)
+    created_at = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+    for i in range(n):
+        yield ExportRow(
+            id=uuid.UUID(int=i), date=start + timedelta(days=i % 3650),
+            word_count=70, created_at=created_at, content=CONTENT,
+        )
+
+
+@pytest.fixture
+def export_client(monkeypatch):
+    def make(rows):
+        session = FakeSession(results=[rows])
+        monkeypatch.setattr(entries, "ReadSessionLocal", lambda: session)
+        return TestClient(app), session
+
+    return make
+
+
+def test_ndjson_export(export_client):
+    client, db = export_client(list(make_rows(3)))
+
+    response = client.get("/api/v1/entries/export", params={"user_id": str(uuid.uuid4())})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [str(uuid.UUID(int=i)) for i in range(3)]
+    assert lines[0]["date"] == "2015-01-01"
+    assert lines[0]["content"] == CONTENT
+    assert db.executed[0][0].get_execution_options()["yield_per"] == settings.EXPORT_BATCH_SIZE
+
+
+def test_csv_export(export_client):
+    client, _ = export_client(list(make_rows(2)))
+
+    response = client.get("/api/v1/entries/export", params={"user_id": str(uuid.uuid4()), "format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "date", "word_count", "created_at", "content"]
+    assert len(rows) == 3
+    assert rows[2][1] == "2015-01-02"
+
+
+def test_csv_export_without_entries_has_header(export_client):
+    client, _ = export_client([])
+
+    response = client.get("/api/v1/entries/export", params={"user_id": str(uuid.uuid4()), "format": "csv"})
+
+    assert response.text.splitlines() == ["id,date,word_count,created_at,content"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+async def test_export_memory_is_bounded(fmt):
+    rows = 100_000
+    db = FakeSession(results=[make_rows(rows)])
+    exported = 0
+
+    tracemalloc.start()
+    try:
+        async for chunk in _export_chunks(db, uuid.uuid4(), fmt):
+            exported += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # ~50 MB of output, with no more than a couple of batches alive at once
+    assert exported > rows * len(CONTENT)
+    assert peak < 5 * 1024 * 1024
@@ -0,0 +1,115 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from conftest import FakeSession
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.main import app
+from app.models.entry import Entry
+from app.routers.entries import _decode_cursor, _encode_cursor
+
+NOW = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def make_entries(n):
+    return [
+        Entry(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), content=f"Entry number {i} " * 20,
+            date=date(2025, 3, 1) - timedelta(days=i), word_count=60, created_at=NOW,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def client_with():
+    def make(*results):
+        session = FakeSession(results=list(results))
+        app.dependency_overrides[get_db] = lambda: session
+        return TestClient(app), session
+
+    yield make
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_page_sets_next_cursor(client_with):
+    entries = make_entries(3)
+    client, db = client_with(entries)
+
+    response = client.get("/api/v1/entries/", params={"user_id": str(uuid.uuid4()), "limit": 2})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [str(e.id) for e in entries[:2]]
+    assert _decode_cursor(response.headers["X-Next-Cursor"]) == (entries[1].date, entries[1].id)
+    statement = db.executed[0][0]
+    assert statement._limit == 3
+
+
+def test_last_page_has_no_cursor(client_with):
+    entries = make_entries(2)
+    client, db = client_with(entries)
+
+    response = client.get(
+        "/api/v1/entries/",
+        params={"user_id": str(uuid.uuid4()), "limit": 2, "cursor": _encode_cursor(date(2025, 3, 5), uuid.uuid4())},
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert "X-Next-Cursor" not in response.headers
+    assert "(entries.date, entries.id) <" in str(db.executed[0][0])
+
+
+def test_summary_view_ships_snippets(client_with):
+    row = SimpleNamespace(id=uuid.uuid4(), date=date(2025, 3, 1), word_count=60, created_at=NOW, snippet="Entry number 0")
+    client, db = client_with([row])
+
+    response = client.get("/api/v1/entries/", params={"user_id": str(uuid.uuid4()), "view": "summary"})
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": str(row.id), "date": "2025-03-01", "word_count": 60,
+        "snippet": "Entry number 0", "created_at": "2025-03-01T12:00:00Z",
+    }]
+    assert "left(entries.content" in str(db.executed[0][0])
+
+
+def test_rejects_bad_cursor_and_oversized_pages(client_with):
+    client, _ = client_with()
+    user_id = str(uuid.uuid4())
+
+    assert client.get("/api/v1/entries/", params={"user_id": user_id, "cursor": "nope"}).status_code == 400
+    assert client.get("/api/v1/entries/", params={"user_id": user_id, "limit": 10_000}).status_code == 422
+
+
+def test_search_filter_uses_full_text_index(client_with):
+    client, db = client_with([])
+
+    response = client.get("/api/v1/entries/", params={"user_id": str(uuid.uuid4()), "search": "postgres"})
+
+    assert response.status_code == 200
+    sql = str(db.executed[0][0])
+    assert "entries.search_vector @@ websearch_to_tsquery('english'::regconfig" in sql
+    assert "ILIKE" not in sql.upper()
+
+
+def test_search_endpoint_returns_ranked_headlines(client_with):
+    row = SimpleNamespace(
+        id=uuid.uuid4(), date=date(2025, 3, 1), word_count=60, rank=0.4,
+        headline="tuned the <mark>postgres</mark> planner",
+    )
+    client, db = client_with([row])
+
+    response = client.get("/api/v1/entries/search", params={"user_id": str(uuid.uuid4()), "q": "postgres", "limit": 5})
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": str(row.id), "date": "2025-03-01", "word_count": 60, "rank": 0.4,
+        "headline": "tuned the <mark>postgres</mark> planner",
+    }]
+    sql = str(db.executed[0][0])
+    assert "ts_rank_cd" in sql and "ts_headline" in sql
+    assert client.get("/api/v1/entries/search", params={"user_id": str(uuid.uuid4()), "q": ""}).status_code == 422
@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from conftest import FakeSession
+
+from app.services.achievement_catalog import achievement_catalog
+from app.services.gamification import UserStats, evaluate_rules, gamification_service
+
+FIRST_STEP, STREAK_3, WORDS_1000 = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+CATALOG_ROWS = [
+    (FIRST_STEP, "First Steps", "Created your first entry.", "Footprints", "FIRST_STEP"),
+    (STREAK_3, "On Fire", "Reached a 3-day streak.", "Flame", "STREAK_3"),
+    (WORDS_1000, "Wordsmith", "Wrote 1000 total words.", "Feather", "WORDS_1000"),
+]
+
+
+@pytest_asyncio.fixture
+async def catalog():
+    achievement_catalog.invalidate()
+    await achievement_catalog.load(FakeSession(results=[CATALOG_ROWS]))
+    yield achievement_catalog
+    achievement_catalog.invalidate()
+
+
+def test_evaluate_rules():
+    assert evaluate_rules(UserStats(0, 1, 20)) == {"FIRST_STEP"}
+    assert evaluate_rules(UserStats(7, 10, 1000)) == {
+        "FIRST_STEP", "STREAK_3", "STREAK_7", "WORDS_1000", "ENTRIES_10",
+    }
+
+
+@pytest.mark.asyncio
+async def test_unlocks_in_one_insert_and_commit(catalog):
+    db = FakeSession(results=[
+        [(3, 4, 200)],
+        [(FIRST_STEP,)],
+        [(STREAK_3,)],
+    ])
+
+    unlocked = await gamification_service.check_achievements(uuid.uuid4(), db)
+
+    assert unlocked == ["On Fire"]
+    assert len(db.executed) == 3
+    assert db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_nothing_new_skips_the_write(catalog):
+    db = FakeSession(results=[[(0, 4, 200)], [(FIRST_STEP,)]])
+
+    assert await gamification_service.check_achievements(uuid.uuid4(), db) == []
+    assert len(db.executed) == 2
+    assert db.commits == 0
+
+
+@pytest.mark.asyncio
+async def test_catalog_loads_once_until_invalidated():
+    achievement_catalog.invalidate()
+    db = FakeSession(results=[CATALOG_ROWS, CATALOG_ROWS[:1]])
+    try:
+        assert (await achievement_catalog.by_criteria(db, "STREAK_3")).id == STREAK_3
+        assert (await achievement_catalog.by_id(db, WORDS_1000)).name == "Wordsmith"
+        assert len(await achievement_catalog.all(db)) == 3
+        assert len(db.executed) == 1
+
+        achievement_catalog.invalidate()
+        assert await achievement_catalog.by_criteria(db, "STREAK_3") is None
+        assert len(db.executed) == 2
+    finally:
+        achievement_catalog.invalidate()
@@ -0,0 +1,65 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from conftest import FakeSession
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import get_read_db
+from app.main import app
+from app.services.embedding_cache import embedding_cache, query_embedding_cache
+
+
+@pytest.fixture
+def client_with(fake_model, monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_STRATEGY", "exact")
+
+    def make(*results):
+        session = FakeSession(results=list(results))
+        app.dependency_overrides[get_read_db] = lambda: session
+        return TestClient(app), session
+
+    yield make
+    app.dependency_overrides.pop(get_read_db, None)
+
+
+def test_returns_scored_results(client_with):
+    row = SimpleNamespace(id=uuid.uuid4(), date=date(2025, 3, 1), content="Tuned autovacuum " * 30, word_count=60, distance=0.25)
+    client, db = client_with([row])
+
+    response = client.get("/api/v1/entries/semantic", params={
+        "user_id": str(uuid.uuid4()), "q": "postgres maintenance", "k": 3, "start_date": "2025-01-01",
+    })
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": str(row.id), "date": "2025-03-01", "word_count": 60,
+        "snippet": row.content[:settings.ENTRY_SNIPPET_CHARS], "score": 0.75,
+    }]
+    params = db.executed[0][1]
+    assert params["k"] == 3
+    assert params["start_date"] == date(2025, 1, 1)
+    # Vectors from other model versions are never compared
+    assert params["model_version"] == settings.EMBEDDING_MODEL_VERSION
+    assert "embedding_model_version = :model_version" in str(db.executed[0][0])
+
+
+def test_repeated_queries_skip_the_model(client_with, fake_model):
+    client, _ = client_with()
+    params = {"user_id": str(uuid.uuid4()), "q": "What did I learn about Postgres?"}
+
+    for _ in range(3):
+        assert client.get("/api/v1/entries/semantic", params=params).status_code == 200
+
+    assert len(fake_model.calls) == 1
+    assert query_embedding_cache.stats()["hits"] == 2
+    assert embedding_cache.stats()["size"] == 0
+
+
+def test_rejects_out_of_range_k(client_with):
+    client, _ = client_with()
+    params = {"user_id": str(uuid.uuid4()), "q": "postgres", "k": settings.SEMANTIC_SEARCH_MAX_K + 1}
+
+    assert client.get("/api/v1/entries/semantic", params=params).status_code == 422
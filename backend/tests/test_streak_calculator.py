@@ -0,0 +1,124 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from conftest import FakeSession
+
+from app.models.streak import StreakData
+from app.routers.streaks import get_streak
+from app.services import streak_calculator
+from app.services.streak_calculator import (
+    StreakSummary,
+    apply_entry_date,
+    effective_current_streak,
+    summarize_dates,
+)
+
+TODAY = date(2025, 6, 30)
+
+
+def in_memory_fetcher(dates, calls=None):
+    async def fetch(start, end):
+        if calls is not None:
+            calls.append((start, end))
+        return sorted((d for d in dates if start <= d < end), reverse=True)
+    return fetch
+
+
+async def replay(entry_dates):
+    """Insert entries one by one through the incremental path."""
+    summary = StreakSummary(0, None, None, 0)
+    seen = set()
+    for entry_date in entry_dates:
+        is_new_day = entry_date not in seen
+        seen.add(entry_date)
+        summary = await apply_entry_date(
+            summary, entry_date, is_new_day, in_memory_fetcher(seen), today=TODAY
+        )
+    return summary
+
+
+def test_effective_streak_expires_after_a_missed_day():
+    start, last = TODAY - timedelta(days=4), TODAY - timedelta(days=1)
+    assert effective_current_streak(last, start, TODAY) == 4
+    assert effective_current_streak(last, start, TODAY + timedelta(days=1)) == 0
+    assert effective_current_streak(None, None, TODAY) == 0
+
+
+@pytest.mark.asyncio
+async def test_backdated_entry_merges_runs_across_chunks(monkeypatch):
+    monkeypatch.setattr(streak_calculator, "BACKFILL_CHUNK_DAYS", 3)
+    older_run = [TODAY - timedelta(days=d) for d in range(12, 3, -1)]
+    recent_run = [TODAY - timedelta(days=d) for d in range(2, -1, -1)]
+
+    summary = await replay(older_run + recent_run)
+    assert summary.current_streak == 3
+
+    # Filling the one-day gap joins the two runs into a 13 day streak
+    summary = await replay(older_run + recent_run + [TODAY - timedelta(days=3)])
+    assert summary.current_streak == 13
+    assert summary.current_run_start == TODAY - timedelta(days=12)
+
+
+@pytest.mark.asyncio
+async def test_backdated_entry_far_from_the_run_reads_nothing():
+    calls = []
+    summary = summarize_dates([TODAY, TODAY - timedelta(days=1)], TODAY)
+    summary = await apply_entry_date(
+        summary, TODAY - timedelta(days=40), True, in_memory_fetcher(set(), calls), today=TODAY
+    )
+    assert calls == []
+    assert summary.current_streak == 2
+    assert summary.total_entries == 3
+
+
+@pytest.mark.asyncio
+async def test_incremental_matches_full_recompute():
+    rng = random.Random(11)
+    for _ in range(300):
+        entry_dates = [
+            TODAY - timedelta(days=rng.randint(0, 25))
+            for _ in range(rng.randint(1, 30))
+        ]
+        expected = summarize_dates(sorted(set(entry_dates), reverse=True), TODAY)
+        assert await replay(entry_dates) == expected, entry_dates
+
+
+@pytest.mark.asyncio
+async def test_streak_endpoint_is_read_only():
+    yesterday = date.today() - timedelta(days=1)
+    row = StreakData(
+        current_streak=1, longest_streak=2, total_entries=5,
+        last_entry_date=yesterday, current_run_start=yesterday - timedelta(days=3),
+    )
+    db = FakeSession(results=[[row]])
+
+    assert await get_streak(uuid.uuid4(), db) == {"current_streak": 4, "longest_streak": 4}
+    assert db.commits == 0 and db.added == []
+    assert len(db.executed) == 1
+
+
+def test_schema_upgrade_backfills_run_start_after_adding_it():
+    from app.database import SCHEMA_UPGRADES
+
+    add_column = next(i for i, s in enumerate(SCHEMA_UPGRADES) if "ADD COLUMN IF NOT EXISTS current_run_start" in s)
+    backfill = next(i for i, s in enumerate(SCHEMA_UPGRADES) if "SET current_run_start" in s)
+    assert add_column < backfill
+    # Idempotent: only rows that were never tracked incrementally
+    assert "s.current_run_start IS NULL" in SCHEMA_UPGRADES[backfill]
+
+
+@pytest.mark.asyncio
+async def test_full_recompute_locks_the_row_before_reading_dates():
+    today = date.today()
+    row = StreakData(user_id=uuid.uuid4(), longest_streak=1)
+    db = FakeSession(results=[[row], [(today,), (today - timedelta(days=1),)]])
+
+    assert await streak_calculator.calculate_streak(row.user_id, db) == (2, 2)
+
+    lock, dates = (str(statement) for statement, _ in db.executed)
+    assert "FROM streak_data" in lock and "FOR UPDATE" in lock
+    assert "FROM entries" in dates
+    assert row.current_run_start == today - timedelta(days=1)
+    assert db.commits == 1
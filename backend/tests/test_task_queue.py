@@ -0,0 +1,190 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from conftest import FakeSession
+
+from app.models.outbox import OutboxTask
+from app.models.streak import StreakData
+from app.routers import entries as entries_router
+from app.schemas.entry import EntryCreate
+from app.services import gamification
+from app.services.task_queue import TaskQueue, task_queue
+
+
+def pending_task(kind="echo"):
+    return OutboxTask(kind=kind, payload={"n": 1}, attempts=0, created_at=datetime.now(timezone.utc))
+
+
+def queue_over(*claims, max_attempts=3):
+    """A worker whose claims return the given tasks in order, then nothing."""
+    # Handlers run on the claiming session
+    session_results = [[[task]] for task in claims]
+
+    def session_factory():
+        return FakeSession(results=session_results.pop(0) if session_results else [])
+
+    return TaskQueue(inline=False, poll_interval=0.01, max_attempts=max_attempts, session_factory=session_factory)
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_and_marks_tasks():
+    task = pending_task()
+    queue = queue_over(task)
+    seen = []
+
+    @queue.handler("echo")
+    async def echo(payload, db):
+        seen.append(payload)
+
+    assert await queue.run_pending() == 1
+    assert seen == [{"n": 1}]
+    assert task.processed_at is not None
+    assert queue.stats()["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_task_is_retried_then_given_up():
+    task = pending_task()
+    queue = queue_over(task, task, max_attempts=2)
+
+    @queue.handler("echo")
+    async def boom(payload, db):
+        raise RuntimeError("database went away")
+
+    await queue.run_pending()
+
+    assert task.attempts == 2
+    assert task.last_error == "RuntimeError: database went away"
+    assert task.processed_at is not None
+    assert (queue.retried, queue.failed) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_inline_dispatch_runs_on_the_callers_session():
+    queue = TaskQueue(inline=True, poll_interval=1, max_attempts=1)
+    db = FakeSession()
+    calls = []
+
+    @queue.handler("echo")
+    async def echo(payload, session):
+        calls.append(session)
+
+    task = queue.enqueue(db, "echo", {"n": 1})
+    await queue.dispatch(task, db)
+
+    assert calls == [db]
+    assert db.added == [task]
+    assert task.processed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_create_entry_commits_outbox_task_with_entry(fake_model, fake_db):
+    content = (
+        "This morning I debugged the FastAPI lifespan hook for 2 hours and discovered "
+        "that the Postgres container was not ready, so I added a retry loop with 5 attempts."
+    )
+    user_id = uuid.uuid4()
+    created = await entries_router.create_entry(
+        EntryCreate(content=content, date=date(2025, 3, 1)), user_id, fake_db
+    )
+
+    tasks = [obj for obj in fake_db.added if isinstance(obj, OutboxTask)]
+    assert [task.kind for task in tasks] == ["entry_created"]
+    assert tasks[0].payload == {
+        "entry_id": str(created.id), "user_id": str(user_id), "date": "2025-03-01",
+    }
+    assert tasks[0].processed_at is None
+    assert not task_queue.inline
+
+
+class SavepointSession(FakeSession):
+    """FakeSession whose savepoint restores `row` when the block raises."""
+
+    def __init__(self, row, results):
+        super().__init__(results=results)
+        self.row = row
+
+    async def __aenter__(self):
+        self._snapshot = dict(vars(self.row))
+        return self
+
+    async def __aexit__(self, exc_type, *exc_info):
+        if exc_type is not None and self.savepoints:
+            vars(self.row).update(self._snapshot)
+        return False
+
+
+@pytest.mark.asyncio
+async def test_retried_entry_task_counts_the_day_once(monkeypatch):
+    today = date.today()
+    row = StreakData(
+        user_id=uuid.uuid4(), current_streak=1, longest_streak=1, total_entries=1,
+        last_entry_date=today - timedelta(days=1), current_run_start=today - timedelta(days=1),
+    )
+    task = OutboxTask(
+        kind="entry_created", attempts=0, created_at=datetime.now(timezone.utc),
+        payload={"entry_id": str(uuid.uuid4()), "user_id": str(row.user_id), "date": today.isoformat()},
+    )
+    # Claim, locked streak row, "no earlier entry that day"
+    sessions = iter([SavepointSession(row, [[task], [row], []]) for _ in range(2)])
+    queue = TaskQueue(inline=False, poll_interval=1, max_attempts=3, session_factory=sessions.__next__)
+    queue._handlers = task_queue._handlers
+    failures = [RuntimeError("achievements table locked")]
+
+    async def flaky_check_achievements(user_id, db, commit=True):
+        assert not commit
+        if failures:
+            raise failures.pop()
+        return []
+
+    monkeypatch.setattr(gamification.gamification_service, "check_achievements", flaky_check_achievements)
+
+    await queue._process_one()
+    assert (task.attempts, row.total_entries) == (1, 1)
+
+    await queue._process_one()
+    assert task.processed_at is not None
+    assert (row.total_entries, row.current_streak) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_expired_rows_in_batches(monkeypatch):
+    monkeypatch.setattr("app.services.task_queue._PRUNE_BATCH", 2)
+    sessions = [FakeSession(results=[[1, 2]]), FakeSession(results=[[3]])]
+    queue = TaskQueue(
+        inline=False, poll_interval=1, max_attempts=1,
+        session_factory=iter(sessions).__next__, retention_seconds=3600,
+    )
+
+    assert await queue.prune() == 3
+    statement, _ = sessions[0].executed[0]
+    sql = str(statement)
+    assert sql.startswith("DELETE FROM task_outbox")
+    assert "task_outbox.processed_at <" in sql
+    assert sessions[0].commits == sessions[1].commits == 1
+    assert queue.stats()["pruned"] == 3
+
+
+@pytest.mark.asyncio
+async def test_prune_runs_at_most_once_per_interval():
+    queue = TaskQueue(inline=True, poll_interval=1, max_attempts=1, session_factory=FakeSession, prune_interval=3600)
+    db = FakeSession()
+
+    @queue.handler("echo")
+    async def echo(payload, session):
+        pass
+
+    await queue.dispatch(queue.enqueue(db, "echo", {}), db)
+    assert queue.pruned == 0 and len(db.executed) == 0
+
+    queue.prune_interval = 0
+    calls = []
+
+    async def prune():
+        calls.append(1)
+        return 0
+
+    queue.prune = prune
+    await queue.dispatch(queue.enqueue(db, "echo", {}), db)
+    assert calls == [1]
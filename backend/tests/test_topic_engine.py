@@ -0,0 +1,84 @@
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from conftest import FakeSession
+
+from app.services.topic_engine import TopicEngine, extract_keywords, spherical_kmeans
+
+TOPICS = {
+    "postgres": "Tuned the postgres planner and rewrote a slow postgres index query",
+    "guitar": "Practiced guitar scales and a new guitar chord progression",
+    "spanish": "Studied spanish verbs and read a spanish news article",
+}
+
+
+def topic_rows(per_topic=6, seed=0):
+    """Entries around one random direction per topic, largest topic first."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for extra, (topic, content) in enumerate(TOPICS.items()):
+        center = rng.standard_normal(384)
+        for _ in range(per_topic + 2 - extra):
+            embedding = center + 0.1 * rng.standard_normal(384)
+            rows.append(SimpleNamespace(content=content, embedding=embedding.astype(np.float32)))
+    return rows
+
+
+def test_extract_keywords_drops_stop_words():
+    assert extract_keywords("Today I learned that the Postgres planner is really clever, Postgres!") == {
+        "postgres": 2, "planner": 1, "clever": 1,
+    }
+
+
+def test_spherical_kmeans_separates_clusters():
+    rows = topic_rows()
+    vectors = np.stack([row.embedding for row in rows])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    centroids, labels = spherical_kmeans(vectors, 3)
+
+    assert centroids.shape == (3, 384)
+    assert np.allclose(np.linalg.norm(centroids, axis=1), 1, atol=1e-5)
+    assert len(set(labels[:8])) == len(set(labels[8:15])) == len(set(labels[15:])) == 1
+    assert len({labels[0], labels[8], labels[15]}) == 3
+
+
+@pytest.mark.asyncio
+async def test_topics_are_cached_and_updated_incrementally():
+    engine = TopicEngine(max_clusters=3, max_entries=500, max_users=10)
+    user_id = uuid.uuid4()
+    rows = topic_rows()
+    db = FakeSession(results=[rows])
+
+    assert await engine.top_topics(db, user_id) == ["Postgres", "Guitar", "Spanish"]
+
+    # New spanish entries move "Spanish" to the top without another query
+    spanish = [row for row in rows if "spanish" in row.content][0]
+    for _ in range(3):
+        engine.add(user_id, spanish.embedding, spanish.content)
+    assert await engine.top_topics(db, user_id) == ["Spanish", "Postgres", "Guitar"]
+    assert len(db.executed) == 1
+    assert engine.stats() == {"users": 1, "hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_refits_after_many_new_entries():
+    engine = TopicEngine(max_clusters=3, max_entries=500, max_users=10, refit_ratio=0.5)
+    user_id = uuid.uuid4()
+    rows = topic_rows()
+    db = FakeSession(results=[rows, rows])
+
+    await engine.top_topics(db, user_id)
+    for row in rows[: len(rows) // 2 + 1]:
+        engine.add(user_id, row.embedding, row.content)
+    await engine.top_topics(db, user_id)
+
+    assert len(db.executed) == 2
+
+
+@pytest.mark.asyncio
+async def test_user_without_entries_has_no_topics():
+    engine = TopicEngine(max_clusters=3, max_entries=500, max_users=10)
+    assert await engine.top_topics(FakeSession(), uuid.uuid4()) == []
@@ -0,0 +1,99 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.user_embedding_cache import UserEmbeddingCache
+from conftest import FakeSession
+
+
+def _rows(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            date=date(2024, 1, 1 + i % 28),
+            content=f"Entry {i} about Kubernetes",
+            word_count=20 + i,
+            embedding=rng.standard_normal(384).astype(np.float32),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_top_k_matches_brute_force_and_skips_database_once_loaded():
+    rows = _rows(50)
+    cache = UserEmbeddingCache(max_bytes=10**8, max_rows_per_user=100)
+    db = FakeSession(results=[rows])
+    user_id = uuid.uuid4()
+    query = np.random.default_rng(1).standard_normal(384)
+
+    matches = await cache.nearest(db, user_id, query, k=3)
+    again = await cache.nearest(db, user_id, query, k=3)
+
+    matrix = np.stack([row.embedding for row in rows])
+    similarities = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    expected = [rows[i].id for i in np.argsort(-similarities)[:3]]
+    assert [match.id for match in matches] == expected
+    assert matches[0].distance == pytest.approx(1 - similarities.max(), abs=1e-5)
+    assert again == matches
+    assert len(db.executed) == 1
+
+
+@pytest.mark.asyncio
+async def test_added_entry_is_searchable():
+    cache = UserEmbeddingCache(max_bytes=10**8, max_rows_per_user=100)
+    user_id = uuid.uuid4()
+    await cache.load(FakeSession(results=[_rows(5)]), user_id)
+
+    new_entry = _rows(1, seed=7)[0]
+    cache.add(user_id, new_entry)
+    matches = await cache.nearest(FakeSession(), user_id, new_entry.embedding, k=1)
+
+    assert matches[0].id == new_entry.id
+    assert matches[0].distance == pytest.approx(0, abs=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_large_histories_fall_back_to_database():
+    cache = UserEmbeddingCache(max_bytes=10**8, max_rows_per_user=10)
+
+    result = await cache.nearest(FakeSession(results=[_rows(11)]), uuid.uuid4(), np.ones(384))
+
+    assert result is None
+    assert cache.stats()["users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_user_evicted_by_bytes():
+    one_user_bytes = 10 * (384 * 4 + 200)
+    cache = UserEmbeddingCache(max_bytes=int(one_user_bytes * 2.5), max_rows_per_user=100)
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    await cache.load(FakeSession(results=[_rows(10)]), first)
+    await cache.load(FakeSession(results=[_rows(10)]), second)
+    await cache.nearest(FakeSession(), first, np.ones(384))
+    await cache.load(FakeSession(results=[_rows(10)]), third)
+
+    assert cache.stats()["users"] == 2
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    db = FakeSession(results=[_rows(10)])
+    await cache.nearest(db, second, np.ones(384))
+    assert len(db.executed) == 1  # second was evicted and had to be reloaded
+
+
+@pytest.mark.asyncio
+async def test_oversized_users_are_bounded_lru(monkeypatch):
+    monkeypatch.setattr("app.services.user_embedding_cache._MAX_OVERSIZED_USERS", 2)
+    cache = UserEmbeddingCache(max_bytes=10**8, max_rows_per_user=1)
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    for user_id in (first, second):
+        await cache.load(FakeSession(results=[_rows(2)]), user_id)
+    await cache.load(FakeSession(), first)  # remembered: no query, refreshed
+    await cache.load(FakeSession(results=[_rows(2)]), third)
+
+    assert list(cache._oversized) == [first, third]
@@ -0,0 +1,90 @@
+import uuid
+
+import numpy as np
+import pytest
+from conftest import FakeSession
+
+from app.config import settings
+from app.services.vector_search import nearest_entries
+
+QUERY = np.full(384, 1 / np.sqrt(384), dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_binary_prefilters_by_hamming_then_reranks(monkeypatch):
+    monkeypatch.setattr(settings, "BINARY_RERANK_FACTOR", 10)
+    db = FakeSession()
+
+    await nearest_entries(db, uuid.uuid4(), QUERY, k=5, strategy="binary")
+
+    (_, hnsw_params), (statement, params) = db.executed
+    sql = " ".join(str(statement).split())
+    assert "ORDER BY binary_quantize(embedding)::bit(384) <~> binary_quantize(CAST(:embedding AS vector))::bit(384)" in sql
+    assert "ORDER BY distance ASC LIMIT :k" in sql
+    assert (params["candidates"], params["k"]) == (50, 5)
+    # Without iterative scans one HNSW scan is capped at ef_search rows
+    assert int(hnsw_params["ef_search"]) >= 50
+
+
+@pytest.mark.asyncio
+async def test_halfvec_orders_by_the_indexed_cast():
+    db = FakeSession()
+
+    await nearest_entries(db, uuid.uuid4(), QUERY, k=3, strategy="halfvec")
+
+    statement, params = db.executed[1]
+    sql = " ".join(str(statement).split())
+    assert "ORDER BY embedding::halfvec(384) <=> CAST(:embedding AS halfvec(384))" in sql
+    # Reported distances stay full precision
+    assert "(embedding <=> CAST(:embedding AS vector)) AS distance" in sql
+    assert params["candidates"] == 3
+
+
+@pytest.mark.asyncio
+async def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        await nearest_entries(FakeSession(), uuid.uuid4(), QUERY, strategy="ivfflat")
+
+
+def test_schema_upgrades_update_extension_before_vector_indexes():
+    from app.database import SCHEMA_UPGRADES
+
+    update = SCHEMA_UPGRADES.index("ALTER EXTENSION vector UPDATE")
+    first_index = next(i for i, s in enumerate(SCHEMA_UPGRADES) if "USING hnsw" in s)
+
+    assert update < first_index
+
+
+def test_direct_entry_inserts_default_to_current_model_version():
+    from app.config import settings
+    from app.models.entry import Entry
+
+    default = Entry.__table__.c.embedding_model_version.default
+
+    assert default.arg(None) == settings.EMBEDDING_MODEL_VERSION
+
+
+@pytest.mark.asyncio
+async def test_iterative_scan_off_skips_the_setting(monkeypatch):
+    monkeypatch.setattr(settings, "HNSW_ITERATIVE_SCAN", "off")
+    db = FakeSession()
+
+    await nearest_entries(db, uuid.uuid4(), QUERY, k=3, strategy="hnsw")
+
+    statement, params = db.executed[0]
+    assert "iterative_scan" not in str(statement)
+    assert set(params) == {"ef_search"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("iterative_scan, expected", [("strict_order", "exact"), ("off", "hnsw")])
+async def test_old_pgvector_falls_back_to_exact(monkeypatch, iterative_scan, expected):
+    from app.services.vector_search import check_pgvector
+
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_STRATEGY", "hnsw")
+    monkeypatch.setattr(settings, "HNSW_ITERATIVE_SCAN", iterative_scan)
+
+    warning = await check_pgvector(FakeSession(results=[["0.7.4"]]))
+
+    assert settings.VECTOR_SEARCH_STRATEGY == expected
+    assert (warning is not None) == (expected == "exact")
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import main
+from app.config import settings
+from app.services.ai_validator import ai_validator
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_until_ready(monkeypatch):
+    pings, loads, delays = [], [], []
+
+    async def warm_db_pool():
+        pings.append(1)
+        if len(pings) < 3:
+            raise ConnectionRefusedError("the database system is starting up")
+
+    async def model_warm_up():
+        loads.append(1)
+        if len(loads) < 2:
+            raise RuntimeError("model download failed")
+        ai_validator.warmed_up = True
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(main, "warm_db_pool", warm_db_pool)
+    monkeypatch.setattr(ai_validator, "warm_up", model_warm_up)
+    monkeypatch.setattr(ai_validator, "warmed_up", False)
+    monkeypatch.setattr(settings, "PRELOAD_EMBEDDING_MODEL", True)
+    monkeypatch.setattr(main.asyncio, "sleep", sleep)
+    app = SimpleNamespace(state=SimpleNamespace(db_pool_warm=False))
+
+    await main.warm_up(app)
+
+    assert app.state.db_pool_warm and ai_validator.warmed_up
+    # The pool isn't re-warmed once it succeeded, while the model load is retried
+    assert (len(pings), len(loads)) == (3, 2)
+    assert delays == [2, 4, 8]
@@ -1,6 +1,7 @@
 'use client';
 
 import { useEntries } from "@/hooks/useEntries";
+import { useDebounce } from "@/hooks/useDebounce";
 import { useCurrentUser } from "@/hooks/useCurrentUser";
 import { formatDate } from "@/lib/utils";
 import { Card, CardHeader, CardTitle, CardContent } from "@/components/ui/card";
@@ -18,12 +19,12 @@ export default function EntriesPage() {
     const [date, setDate] = useState<Date | undefined>(undefined);
 
     const { userId } = useCurrentUser();
-    const { entries, isLoading } = useEntries(userId || "");
-
-    const filteredEntries = entries?.filter(entry => {
-        const matchesSearch = entry.content.toLowerCase().includes(search.toLowerCase());
-        const matchesDate = date ? entry.date === date.toISOString().split('T')[0] : true;
-        return matchesSearch && matchesDate;
+    const debouncedSearch = useDebounce(search.trim(), 300);
+    const day = date ? format(date, "yyyy-MM-dd") : undefined;
+    const { entries, isLoading, hasMore, loadMore, isLoadingMore } = useEntries(userId || "", {
+        search: debouncedSearch || undefined,
+        start_date: day,
+        end_date: day,
     });
 
     if (isLoading) return <div className="p-8 text-center">Loading entries...</div>;
@@ -79,13 +80,13 @@ export default function EntriesPage() {
                 </div>
             </div>
 
-            {filteredEntries?.length === 0 ? (
+            {entries?.length === 0 ? (
                 <div className="text-center py-20 bg-gray-50 rounded-lg border border-dashed">
                     <p className="text-gray-500">No entries found matching your criteria.</p>
                 </div>
             ) : (
                 <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4">
-                    {filteredEntries?.map((entry) => (
+                    {entries?.map((entry) => (
                         <Card key={entry.id} className="hover:shadow-md transition-all hover:border-primary-200 group flex flex-col h-full">
                             <CardHeader className="pb-3">
                                 <CardTitle className="text-lg flex justify-between items-center text-primary-700">
@@ -102,6 +103,14 @@ export default function EntriesPage() {
                     ))}
                 </div>
             )}
+
+            {hasMore && (
+                <div className="flex justify-center">
+                    <Button variant="outline" onClick={() => loadMore()} disabled={isLoadingMore}>
+                        {isLoadingMore ? "Loading..." : "Load older entries"}
+                    </Button>
+                </div>
+            )}
         </div>
     );
 }
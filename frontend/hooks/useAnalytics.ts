@@ -20,30 +20,30 @@ interface ActivityData {
   entries: number;
 }
 
-export function useAnalytics(userId?: string) {
-  const statsQuery = useQuery({
-    queryKey: ['analytics', 'stats', userId],
-    queryFn: () => api.get<UserStats>(`/analytics/stats?user_id=${userId}`),
-    enabled: !!userId,
-  });
-
-  const summaryQuery = useQuery({
-    queryKey: ['analytics', 'summary', userId],
-    queryFn: () => api.get<AnalyticsSummary>(`/analytics/summary?user_id=${userId}`),
-    enabled: !!userId,
-  });
+interface Dashboard {
+  summary: AnalyticsSummary;
+  stats: UserStats;
+  activity: ActivityData[];
+  streak: {
+    current_streak: number;
+    longest_streak: number;
+  };
+}
 
-  const activityQuery = useQuery({
-    queryKey: ['analytics', 'activity', userId],
-    queryFn: () => api.get<ActivityData[]>(`/analytics/activity?user_id=${userId}`),
+export function useAnalytics(userId?: string) {
+  // One request (and one query on the backend) for every dashboard section
+  const dashboardQuery = useQuery({
+    queryKey: ['analytics', 'dashboard', userId],
+    queryFn: () => api.get<Dashboard>(`/analytics/dashboard?user_id=${userId}`),
     enabled: !!userId,
   });
 
   return {
-    stats: statsQuery.data,
-    summary: summaryQuery.data,
-    activity: activityQuery.data,
-    isLoading: statsQuery.isLoading || summaryQuery.isLoading || activityQuery.isLoading,
-    isError: statsQuery.isError || summaryQuery.isError || activityQuery.isError,
+    stats: dashboardQuery.data?.stats,
+    summary: dashboardQuery.data?.summary,
+    activity: dashboardQuery.data?.activity,
+    streak: dashboardQuery.data?.streak,
+    isLoading: dashboardQuery.isLoading,
+    isError: dashboardQuery.isError,
   };
 }
@@ -0,0 +1,13 @@
+import { useEffect, useState } from 'react';
+
+// Value that only follows `value` once it has stopped changing for `delayMs`
+export function useDebounce<T>(value: T, delayMs: number): T {
+  const [debounced, setDebounced] = useState(value);
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delayMs);
+    return () => clearTimeout(timer);
+  }, [value, delayMs]);
+
+  return debounced;
+}
@@ -1,13 +1,39 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { keepPreviousData, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { api } from '@/lib/api';
 import { Entry } from '@/types';
 
-export function useEntries(userId?: string) {
+// Streak and achievement updates run in the backend task queue after the
+// POST returns (usually within a few hundred ms), so refetch them a few
+// times instead of racing the worker with an immediate refetch.
+const WORKER_REFRESH_DELAYS_MS = [500, 2000, 5000];
+const WORKER_QUERY_KEYS = [['streak'], ['achievements'], ['analytics']];
+
+// Filtering happens server-side (full-text search and date range), so matches
+// outside the pages loaded so far are still found
+export interface EntryFilters {
+  search?: string;
+  start_date?: string; // YYYY-MM-DD
+  end_date?: string;
+}
+
+export function useEntries(userId?: string, filters: EntryFilters = {}) {
   const queryClient = useQueryClient();
+  const { search, start_date, end_date } = filters;
 
-  const entriesQuery = useQuery({
-    queryKey: ['entries', userId],
-    queryFn: () => api.get<Entry[]>(`/entries?user_id=${userId}`),
+  const entriesQuery = useInfiniteQuery({
+    queryKey: ['entries', userId, { search, start_date, end_date }],
+    queryFn: ({ pageParam }) => {
+      const params = new URLSearchParams({ user_id: userId! });
+      if (search) params.set('search', search);
+      if (start_date) params.set('start_date', start_date);
+      if (end_date) params.set('end_date', end_date);
+      if (pageParam) params.set('cursor', pageParam);
+      return api.getPage<Entry>(`/entries?${params}`);
+    },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    // Keep showing the previous results while a new filter loads
+    placeholderData: keepPreviousData,
     enabled: !!userId,
   });
 
@@ -20,14 +46,23 @@ export function useEntries(userId?: string) {
     },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['entries'] });
-      queryClient.invalidateQueries({ queryKey: ['streak'] });
-      queryClient.invalidateQueries({ queryKey: ['achievements'] });
+      // Rollups are written with the entry; the streak part of the dashboard isn't
       queryClient.invalidateQueries({ queryKey: ['analytics'] });
+      for (const delay of WORKER_REFRESH_DELAYS_MS) {
+        setTimeout(() => {
+          for (const queryKey of WORKER_QUERY_KEYS) {
+            queryClient.invalidateQueries({ queryKey });
+          }
+        }, delay);
+      }
     },
   });
 
   return {
-    entries: entriesQuery.data,
+    entries: entriesQuery.data?.pages.flatMap((page) => page.items),
+    hasMore: entriesQuery.hasNextPage,
+    loadMore: entriesQuery.fetchNextPage,
+    isLoadingMore: entriesQuery.isFetchingNextPage,
     isLoading: entriesQuery.isLoading,
     isError: entriesQuery.isError,
     createEntry,
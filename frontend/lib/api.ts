@@ -4,7 +4,7 @@ type FetchOptions = RequestInit & {
   headers?: Record<string, string>;
 };
 
-async function fetchAPI<T>(endpoint: string, options: FetchOptions = {}): Promise<T> {
+async function fetchResponse(endpoint: string, options: FetchOptions = {}): Promise<Response> {
   const { headers, ...rest } = options;
   
   const res = await fetch(`${API_URL}${endpoint}`, {
@@ -24,11 +24,28 @@ async function fetchAPI<T>(endpoint: string, options: FetchOptions = {}): Promis
     throw new Error(errorMessage);
   }
 
+  return res;
+}
+
+async function fetchAPI<T>(endpoint: string, options: FetchOptions = {}): Promise<T> {
+  const res = await fetchResponse(endpoint, options);
   return res.json();
 }
 
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// Keyset-paginated list endpoints return the next page's cursor in a header
+async function fetchPage<T>(endpoint: string, options: FetchOptions = {}): Promise<Page<T>> {
+  const res = await fetchResponse(endpoint, { ...options, method: 'GET' });
+  return { items: await res.json(), nextCursor: res.headers.get('X-Next-Cursor') };
+}
+
 export const api = {
   get: <T>(endpoint: string, options?: FetchOptions) => fetchAPI<T>(endpoint, { ...options, method: 'GET' }),
+  getPage: <T>(endpoint: string, options?: FetchOptions) => fetchPage<T>(endpoint, options),
   post: <T>(endpoint: string, body: any, options?: FetchOptions) => fetchAPI<T>(endpoint, { ...options, method: 'POST', body: JSON.stringify(body) }),
   put: <T>(endpoint: string, body: any, options?: FetchOptions) => fetchAPI<T>(endpoint, { ...options, method: 'PUT', body: JSON.stringify(body) }),
   delete: <T>(endpoint: string, options?: FetchOptions) => fetchAPI<T>(endpoint, { ...options, method: 'DELETE' }),
@@ -12,7 +12,9 @@ from backend.app.models.user import User
 from backend.app.models.entry import Entry
 from backend.app.models.achievement import UserAchievement
 from backend.app.models.streak import StreakData
+from backend.app.config import settings
 from backend.app.services.ai_validator import ai_validator
+from backend.app.services.fingerprint import fingerprint_columns
 from sqlalchemy import delete
 
 async def main():
@@ -53,8 +55,11 @@ async def main():
                 user_id=user_id,
                 content=content,
                 embedding=embedding,
+                # Novelty checks only see rows at the current model version
+                embedding_model_version=settings.EMBEDDING_MODEL_VERSION,
                 date=date.today(),
-                word_count=len(content.split())
+                word_count=len(content.split()),
+                **fingerprint_columns(content)
             )
             db.add(entry)
             await db.commit()
@@ -62,14 +67,14 @@ async def main():
             
             # 3. Validate the SAME content (should be duplicate)
             print("Verifying duplicate detection...")
-            is_valid, reason, feedback = await ai_validator.validate_entry(
+            validation = await ai_validator.validate_entry(
                 content, user_id, db
             )
             
-            print(f"Result: is_valid={is_valid}, reason={reason}")
-            print(f"Feedback: {feedback}")
+            print(f"Result: is_valid={validation.is_valid}, reason={validation.reason}")
+            print(f"Feedback: {validation.feedback}")
             
-            if is_valid:
+            if validation.is_valid:
                 print("FAILURE: Duplicate was NOT detected.")
             else:
                 print("SUCCESS: Duplicate was detected.")